@@ -0,0 +1,287 @@
+"""
+Banc d'essai de bout en bout, entièrement hors ligne : analyse et
+téléchargement de vidéos, shorts, DASH et grandes playlists servis par un
+faux YouTube local (voir benchmarks.fake_youtube). Chaque essai tourne dans
+un interpréteur neuf, isolé (paramètres, caches, dossier de sortie).
+
+    uv run python -m benchmarks.download [--runs 3] [--output results.json]
+    uv run python -m benchmarks.download --compare baseline.json
+
+Mesures : latence d'analyse, listing des playlists, durée et débit du
+téléchargement, durée de fusion (ffmpeg), CPU et pic de mémoire (RSS).
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCHEMA = 1
+SCENARIOS = ("video", "dash", "short", "playlist")
+MIB = 1024 * 1024
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# ── Processus enfant : un essai ───────────────────────────────────────────────
+def _scenario_url(base: str, scenario: str, args) -> str:
+    match scenario:
+        case "video":
+            return f"{base}/watch?v=video-{args.run}"
+        case "dash":
+            return f"{base}/watch?v=dash-{args.run}"
+        case "short":
+            return f"{base}/shorts/short-{args.run}"
+        case "playlist":
+            return f"{base}/playlist?list=PLbench{args.playlist_size}"
+    raise ValueError(scenario)
+
+
+def _peak_rss_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux : Kio ; macOS : octets
+    return round(peak / (MIB if platform.system() == "Darwin" else 1024), 1)
+
+
+def _tree_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def run_child(args) -> dict:
+    from core import AppSettings
+
+    AppSettings.FILE_PATH = args.settings
+
+    from benchmarks.fake_youtube import bench_ydl_pool
+    from models import Playlist, Video
+    from services import Engine, ProgressChannel, YouTubeService
+    from services.ydl_pool import set_ydl_pool
+
+    set_ydl_pool(bench_ydl_pool())
+    url = _scenario_url(args.base_url, args.scenario, args)
+    result = {}
+    cpu_start = os.times()
+
+    start = time.perf_counter()
+    media = YouTubeService(prefetch_thumbnails=False).analyze_url(url)
+    result["analysis_s"] = time.perf_counter() - start
+    if isinstance(media, Playlist):
+        while not media.complete:
+            time.sleep(0.005)
+        result["listing_s"] = time.perf_counter() - start
+        result["entries"] = len(media.entries)
+    if isinstance(media, Video):
+        media.resol_selected = args.quality
+
+    # Canal sans consommateur : évite l'affichage de progression en console
+    engine = Engine(media, ProgressChannel(), output_dir=args.output_dir)
+    start = time.perf_counter()
+    engine.download_media()
+    result["download_s"] = time.perf_counter() - start
+
+    cpu = os.times()
+    size = _tree_size(args.output_dir)
+    result.update(
+        merge_s=engine.recorder.phases.get("merge", 0.0),
+        bytes=size,
+        throughput_mib_s=size / MIB / result["download_s"],
+        cpu_user_s=cpu.user - cpu_start.user,
+        cpu_system_s=cpu.system - cpu_start.system,
+        cpu_children_s=(cpu.children_user + cpu.children_system)
+        - (cpu_start.children_user + cpu_start.children_system),
+        peak_rss_mib=_peak_rss_mib(),
+        retries=engine.recorder.counters.get("retries", 0),
+        fragments=engine.recorder.counters.get("fragments", 0),
+        # Phases cumulées sur toutes les entrées (voir services.metrics)
+        **{f"phase_{k}_s": v for k, v in engine.recorder.phases.items()},
+    )
+    return result
+
+
+# ── Processus parent : orchestration ──────────────────────────────────────────
+def _isolated_run(workdir: Path, scenario: str, run: int, base_url: str, args) -> dict:
+    run_dir = workdir / f"{scenario}-{run}"
+    home = run_dir / "home"
+    output_dir = run_dir / "out"
+    for path in (home, output_dir):
+        path.mkdir(parents=True)
+
+    cookies = run_dir / "cookies.txt"
+    cookies.write_text("# Netscape HTTP Cookie File\n")
+    settings = run_dir / "settings.json"
+    settings.write_text(
+        json.dumps(
+            {
+                "download_folder": str(output_dir),
+                # Fichier de cookies vide : pas d'extraction depuis le navigateur
+                "cookie_file": [str(cookies), True],
+                "playlist_workers": args.playlist_workers,
+            }
+        )
+    )
+    # Caches (métadonnées, miniatures, yt-dlp...) propres à l'essai
+    env = {
+        **os.environ,
+        "HOME": str(home),
+        "XDG_CACHE_HOME": str(home / ".cache"),
+        "XDG_CONFIG_HOME": str(home / ".config"),
+        "LOCALAPPDATA": str(home / "AppData/Local"),
+        "APPDATA": str(home / "AppData/Roaming"),
+    }
+    result_file = run_dir / "result.json"
+    command = [
+        sys.executable, "-m", "benchmarks.download", "--child",
+        "--scenario", scenario,
+        "--run", str(run),
+        "--base-url", base_url,
+        "--settings", str(settings),
+        "--output-dir", str(output_dir),
+        "--result", str(result_file),
+        "--quality", args.quality,
+        "--playlist-size", str(args.playlist_size),
+    ]
+    process = subprocess.run(
+        command,
+        cwd=ROOT,
+        env=env,
+        stdout=None if args.verbose else subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode:
+        raise RuntimeError(f"{scenario} #{run} a échoué :\n{process.stderr or ''}")
+    result = json.loads(result_file.read_text())
+    shutil.rmtree(output_dir, ignore_errors=True)
+    return result
+
+
+def _summarize(runs: list[dict]) -> dict:
+    keys = {k for run in runs for k, v in run.items() if isinstance(v, (int, float))}
+    return {
+        k: round(statistics.median(run[k] for run in runs if run.get(k) is not None), 4)
+        for k in sorted(keys)
+    }
+
+
+def _versions() -> dict:
+    try:
+        from yt_dlp.version import __version__ as yt_dlp_version
+    except ImportError:
+        yt_dlp_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "yt_dlp": yt_dlp_version,
+        "ffmpeg": bool(shutil.which("ffmpeg")),
+    }
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    """Écarts relatifs des médianes, scénario par scénario."""
+    lines = []
+    for scenario, current in report["results"].items():
+        previous = baseline.get("results", {}).get(scenario)
+        if not previous:
+            continue
+        for metric, value in current["median"].items():
+            old = previous["median"].get(metric)
+            if not old or value is None:
+                continue
+            lines.append(
+                f"{scenario:<9} {metric:<18} {old:>12.4g} → {value:>12.4g}"
+                f"  ({(value - old) / old:+.1%})"
+            )
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--video-mb", type=float, default=64)
+    parser.add_argument("--short-mb", type=float, default=8)
+    parser.add_argument("--entry-mb", type=float, default=2)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--playlist-workers", type=int, default=3)
+    parser.add_argument("--quality", default="1080p")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--compare", help="résultats précédents à comparer")
+    parser.add_argument("--keep", action="store_true", help="garder le dossier de travail")
+    parser.add_argument("--verbose", action="store_true")
+    # Processus enfant (usage interne)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    for name in ("--scenario", "--base-url", "--settings", "--output-dir", "--result"):
+        parser.add_argument(name, help=argparse.SUPPRESS)
+    parser.add_argument("--run", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        Path(args.result).write_text(json.dumps(run_child(args)))
+        return 0
+
+    from benchmarks.fake_youtube import FakeYouTubeServer, MediaLibrary
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"scénarios inconnus : {', '.join(sorted(unknown))}")
+
+    workdir = Path(tempfile.mkdtemp(prefix="tubedl-bench-"))
+    try:
+        library = MediaLibrary(
+            workdir / "media", args.video_mb, args.short_mb, args.entry_mb
+        ).build()
+        results = {}
+        with FakeYouTubeServer(library) as server:
+            for scenario in scenarios:
+                runs = [
+                    _isolated_run(workdir, scenario, run, server.url, args)
+                    for run in range(args.runs)
+                ]
+                results[scenario] = {"median": _summarize(runs), "runs": runs}
+                print(f"✔ {scenario} ({args.runs} essai(s))", file=sys.stderr)
+    finally:
+        if args.keep:
+            print(f"Dossier de travail : {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "schema": SCHEMA,
+        "suite": "download",
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": _versions(),
+        "config": {
+            k: getattr(args, k)
+            for k in ("runs", "video_mb", "short_mb", "entry_mb", "playlist_size",
+                      "playlist_workers", "quality")
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+Doublure hors ligne de YouTube pour les bancs d'essai : un serveur HTTP local
+(métadonnées au format "player response", listings de playlists paginés,
+médias progressifs et DASH) et les extracteurs yt-dlp qui le lisent.
+
+Les médias sont de vrais fichiers MP4/M4A si ffmpeg est disponible (la
+fusion peut alors être mesurée), sinon des octets synthétiques de même
+taille, proposés uniquement en formats déjà multiplexés.
+"""
+
+import functools
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MIB = 1024 * 1024
+PAGE_SIZE = 100  # entrées par page de listing, comme YouTube
+FRAGMENT_SIZE = MIB  # taille d'un segment DASH
+
+# Type de média (préfixe de l'id) -> durée en secondes
+DURATIONS = {"video": 180, "dash": 180, "short": 30, "entry": 90}
+
+
+class MediaLibrary:
+    """Fichiers servis par le serveur, générés une fois par type de média."""
+
+    def __init__(self, root, video_mb: float = 64, short_mb: float = 8, entry_mb: float = 2):
+        self.root = str(root)
+        self.sizes = {"video": video_mb, "dash": video_mb, "short": short_mb, "entry": entry_mb}
+        self.ffmpeg = shutil.which("ffmpeg")
+
+    def build(self) -> "MediaLibrary":
+        os.makedirs(self.root, exist_ok=True)
+        for kind, size_mb in self.sizes.items():
+            if not os.path.exists(self.path(kind, "av")):
+                self._generate(kind, size_mb)
+        return self
+
+    def path(self, kind: str, stream: str) -> str:
+        ext = "m4a" if stream == "audio" else "mp4"
+        return os.path.join(self.root, f"{kind}-{stream}.{ext}")
+
+    def size(self, kind: str, stream: str) -> int:
+        return os.path.getsize(self.path(kind, stream))
+
+    def _generate(self, kind, size_mb):
+        duration = DURATIONS[kind]
+        video_bytes = int(size_mb * MIB * 0.9)
+        audio_bytes = int(size_mb * MIB) - video_bytes
+        if self.ffmpeg:
+            kbps = max(100, video_bytes * 8 // 1000 // duration)
+            self._ffmpeg(
+                "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={duration}",
+                "-c:v", "libx264", "-preset", "ultrafast", "-b:v", f"{kbps}k",
+                "-pix_fmt", "yuv420p", "-an", self.path(kind, "video"),
+            )
+            self._ffmpeg(
+                "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+                "-c:a", "aac", "-b:a", "128k", self.path(kind, "audio"),
+            )
+            self._ffmpeg(
+                "-i", self.path(kind, "video"), "-i", self.path(kind, "audio"),
+                "-c", "copy", self.path(kind, "av"),
+            )
+            return
+        # Sans ffmpeg : contenu aléatoire (incompressible), jamais fusionné
+        self._synthetic(self.path(kind, "video"), video_bytes)
+        self._synthetic(self.path(kind, "audio"), audio_bytes)
+        self._synthetic(self.path(kind, "av"), video_bytes + audio_bytes)
+
+    def _ffmpeg(self, *args):
+        subprocess.run(
+            [self.ffmpeg, "-y", "-loglevel", "error", *args],
+            check=True,
+            stdin=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def _synthetic(path, size):
+        block = random.Random(size).randbytes(MIB)
+        with open(path, "wb") as f:
+            for offset in range(0, size, MIB):
+                f.write(block[: min(MIB, size - offset)])
+
+
+def _media_kind(media_id: str) -> str:
+    kind = media_id.split("-", 1)[0]
+    if kind not in DURATIONS:
+        raise KeyError(media_id)
+    return kind
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    library: MediaLibrary = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        parts = [p for p in parsed.path.split("/") if p]
+        try:
+            match parts:
+                case ["api", "player", media_id]:
+                    self._send_json(self._player(media_id))
+                case ["api", "playlist", list_id]:
+                    page = int(parse_qs(parsed.query).get("page", ["0"])[0])
+                    self._send_json(self._playlist(list_id, page))
+                case ["media", name]:
+                    self._send_file(os.path.join(self.library.root, name))
+                case ["media", name, "frag", index]:
+                    self._send_fragment(os.path.join(self.library.root, name), int(index))
+                case _:
+                    self.send_error(404)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client parti (téléchargement interrompu)
+        except (KeyError, ValueError, AttributeError, OSError):
+            self.send_error(404)
+
+    # ── Métadonnées ───────────────────────────────────────────────────────
+    def _base(self) -> str:
+        return f"http://{self.headers['Host']}"
+
+    def _player(self, media_id: str) -> dict:
+        """Sous-ensemble de la "player response" YouTube (videoDetails/streamingData)."""
+        kind = _media_kind(media_id)
+        library, base = self.library, self._base()
+        duration = DURATIONS[kind]
+
+        def stream(itag, stream_name, mime, codecs, height=None):
+            size = library.size(kind, stream_name)
+            fmt = {
+                "itag": itag,
+                "url": f"{base}/media/{os.path.basename(library.path(kind, stream_name))}",
+                "mimeType": f'{mime}; codecs="{codecs}"',
+                "bitrate": size * 8 // duration,
+                "contentLength": str(size),
+                "approxDurationMs": str(duration * 1000),
+            }
+            if height:
+                fmt.update(width=height * 16 // 9, height=height, fps=30)
+            return fmt
+
+        def segmented(fmt, stream_name):
+            # Segments DASH : tranches d'un même fichier, recollées à l'arrivée
+            count = -(-library.size(kind, stream_name) // FRAGMENT_SIZE)
+            fmt.update(dashSegments={"count": count, "size": FRAGMENT_SIZE})
+            return fmt
+
+        muxed = stream(22, "av", "video/mp4", "avc1.64001F, mp4a.40.2", 720)
+        if library.ffmpeg:
+            video = stream(137, "video", "video/mp4", "avc1.640028", 1080)
+            if kind == "dash":
+                video = segmented({**video, "itag": 299}, "video")
+            formats = [muxed]
+            adaptive = [video, stream(140, "audio", "audio/mp4", "mp4a.40.2")]
+        else:
+            # Sans ffmpeg, yt-dlp refuse de fusionner : formats déjà multiplexés
+            formats = [segmented(muxed, "av") if kind == "dash" else muxed]
+            adaptive = []
+        return {
+            "videoDetails": {
+                "videoId": media_id,
+                "title": f"Bench {media_id}",
+                "lengthSeconds": str(duration),
+                "author": "TubeDL Bench",
+                "viewCount": "0",
+                "isLiveContent": False,
+                "thumbnail": {
+                    "thumbnails": [
+                        {"url": f"{base}/vi/{media_id}/hqdefault.jpg", "width": 480, "height": 360}
+                    ]
+                },
+            },
+            "streamingData": {"formats": formats, "adaptiveFormats": adaptive},
+        }
+
+    def _playlist(self, list_id: str, page: int) -> dict:
+        total = int(re.fullmatch(r"PLbench(\d+)", list_id).group(1))
+        first = page * PAGE_SIZE
+        return {
+            "playlistId": list_id,
+            "title": f"Bench playlist ({total})",
+            "totalVideos": total,
+            "pageSize": PAGE_SIZE,
+            "items": [
+                {
+                    "videoId": f"entry-{index}",
+                    "title": f"Bench entry-{index}",
+                    "lengthSeconds": str(DURATIONS["entry"]),
+                }
+                for index in range(first, min(first + PAGE_SIZE, total))
+            ],
+        }
+
+    # ── Envoi ─────────────────────────────────────────────────────────────
+    def _send_json(self, data: dict):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path):
+        size = os.path.getsize(path)
+        start, end = 0, size - 1
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or end), end)
+            if start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self._send_range(path, start, end)
+
+    def _send_fragment(self, path, index):
+        start = index * FRAGMENT_SIZE
+        end = min(start + FRAGMENT_SIZE, os.path.getsize(path)) - 1
+        if start > end:
+            raise ValueError(index)
+        self.send_response(200)
+        self._send_range(path, start, end)
+
+    def _send_range(self, path, start, end):
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        with open(path, "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                chunk = f.read(min(256 * 1024, remaining))
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                remaining -= len(chunk)
+
+
+class FakeYouTubeServer:
+    """Serveur local (port libre choisi par le système), utilisable en `with`."""
+
+    def __init__(self, library: MediaLibrary, host: str = "127.0.0.1", port: int = 0):
+        handler = type("Handler", (_Handler,), {"library": library})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ── Extracteurs yt-dlp ────────────────────────────────────────────────────────
+@functools.cache
+def extractor_classes():
+    """Extracteurs du faux YouTube (import différé de yt_dlp)."""
+    from yt_dlp.extractor.common import InfoExtractor
+    from yt_dlp.utils import InAdvancePagedList, int_or_none
+
+    _HOST = r"https?://(?:127\.0\.0\.1|localhost):\d+"
+
+    def base_url(url):
+        return re.match(_HOST, url).group(0)
+
+    class BenchYoutubeIE(InfoExtractor):
+        IE_NAME = "benchyoutube"
+        _VALID_URL = _HOST + r"/(?:watch\?v=|shorts/)(?P<id>[\w-]+)"
+
+        def _real_extract(self, url):
+            video_id = self._match_id(url)
+            player = self._download_json(
+                f"{base_url(url)}/api/player/{video_id}", video_id
+            )
+            details = player["videoDetails"]
+            streaming = player["streamingData"]
+            return {
+                "id": video_id,
+                "title": details["title"],
+                "duration": int_or_none(details.get("lengthSeconds")),
+                "uploader": details.get("author"),
+                "view_count": int_or_none(details.get("viewCount")),
+                "thumbnails": details["thumbnail"]["thumbnails"],
+                "formats": [
+                    self._format(fmt)
+                    for fmt in streaming["formats"] + streaming["adaptiveFormats"]
+                ],
+            }
+
+        @staticmethod
+        def _format(fmt):
+            mime, _, codecs = fmt["mimeType"].partition("; codecs=")
+            codecs = [c.strip() for c in codecs.strip('"').split(",")]
+            is_video = mime.startswith("video/")
+            result = {
+                "format_id": str(fmt["itag"]),
+                "url": fmt["url"],
+                "ext": "mp4" if is_video else "m4a",
+                "width": fmt.get("width"),
+                "height": fmt.get("height"),
+                "fps": fmt.get("fps"),
+                "tbr": fmt["bitrate"] / 1000,
+                "filesize": int(fmt["contentLength"]),
+                "vcodec": codecs[0] if is_video else "none",
+                "acodec": codecs[-1] if (not is_video or len(codecs) > 1) else "none",
+            }
+            if segments := fmt.get("dashSegments"):
+                result.update(
+                    protocol="http_dash_segments",
+                    fragments=[
+                        {"url": f"{fmt['url']}/frag/{index}"}
+                        for index in range(segments["count"])
+                    ],
+                )
+            return result
+
+    class BenchYoutubeTabIE(InfoExtractor):
+        IE_NAME = "benchyoutube:tab"
+        _VALID_URL = _HOST + r"/playlist\?list=(?P<id>[\w-]+)"
+
+        def _real_extract(self, url):
+            list_id = self._match_id(url)
+            base = base_url(url)
+            first = self._download_json(
+                f"{base}/api/playlist/{list_id}", list_id, query={"page": 0}
+            )
+
+            def fetch_page(page):
+                data = first if page == 0 else self._download_json(
+                    f"{base}/api/playlist/{list_id}", list_id,
+                    note=f"Downloading page {page + 1}", query={"page": page},
+                )
+                for item in data["items"]:
+                    yield self.url_result(
+                        f"{base}/watch?v={item['videoId']}",
+                        BenchYoutubeIE,
+                        item["videoId"],
+                        item["title"],
+                        duration=int_or_none(item.get("lengthSeconds")),
+                    )
+
+            pages = -(-first["totalVideos"] // first["pageSize"])
+            return self.playlist_result(
+                InAdvancePagedList(fetch_page, pages, first["pageSize"]),
+                list_id,
+                first["title"],
+                playlist_count=first["totalVideos"],
+            )
+
+    return [BenchYoutubeIE, BenchYoutubeTabIE]
+
+
+def bench_ydl_pool():
+    """Pool YoutubeDL dont les instances reconnaissent d'abord le faux YouTube."""
+    from services.ydl_pool import YDLPool
+
+    class BenchYDLPool(YDLPool):
+        def _create(self, opts):
+            import yt_dlp
+
+            # Pas de proxy pour 127.0.0.1 ; extracteurs locaux avant le générique
+            ydl = yt_dlp.YoutubeDL({**opts, "proxy": ""}, auto_init=False)
+            for ie in extractor_classes():
+                # Instances : yt-dlp ne sait pas recréer une classe hors registre
+                ydl.add_info_extractor(ie())
+            ydl.add_default_info_extractors()
+            return ydl
+
+    return BenchYDLPool()
@@ -0,0 +1,85 @@
+"""
+Mesure du démarrage de TubeDL : temps d'import des vues et temps jusqu'à la
+première image de la fenêtre, dans un interpréteur neuf à chaque essai.
+Le script échoue (code 1) si le budget est dépassé ou si un module lourd
+est importé avant la première utilisation.
+
+    uv run python -m benchmarks.startup [--runs 5] [--no-window]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+IMPORT_BUDGET = 0.6  # secondes
+FIRST_FRAME_BUDGET = 1.0  # secondes
+# Ne doivent être importés qu'à la première analyse / au premier téléchargement
+LAZY_MODULES = ("yt_dlp", "requests")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import views
+result = {{
+    "import": time.perf_counter() - start,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}
+if {window!r}:
+    app = views.App()
+    app.update()
+    result["first_frame"] = time.perf_counter() - start
+    app.destroy()
+print(json.dumps(result))
+"""
+
+
+def _has_display() -> bool:
+    return platform.system() in ("Windows", "Darwin") or bool(
+        os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    )
+
+
+def _probe(window: bool) -> dict:
+    code = _PROBE.format(lazy=LAZY_MODULES, window=window)
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-window", action="store_true")
+    args = parser.parse_args(argv)
+
+    window = _has_display() and not args.no_window
+    runs = [_probe(window) for _ in range(args.runs)]
+
+    report = {"import": statistics.median(r["import"] for r in runs)}
+    if window:
+        report["first_frame"] = statistics.median(r["first_frame"] for r in runs)
+    report["loaded"] = sorted({m for r in runs for m in r["loaded"]})
+    print(json.dumps(report, indent=2))
+
+    failures = []
+    if report["import"] > IMPORT_BUDGET:
+        failures.append(f"import {report['import']:.3f}s > {IMPORT_BUDGET}s")
+    if window and report["first_frame"] > FIRST_FRAME_BUDGET:
+        failures.append(
+            f"première image {report['first_frame']:.3f}s > {FIRST_FRAME_BUDGET}s"
+        )
+    if report["loaded"]:
+        failures.append(f"imports prématurés : {', '.join(report['loaded'])}")
+
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
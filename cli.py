@@ -0,0 +1,153 @@
+"""
+Mode batch sans interface graphique : analyse puis télécharge une liste d'URL
+et écrit la progression en JSON-lines sur la sortie standard.
+
+    uv run main.py batch urls.txt -j 3 -q 720p -o ~/Vidéos
+
+N'importe aucun module de `views` : fonctionne sans écran.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from services import DownloadScheduler, Engine, ProgressChannel, YouTubeService
+from services import budget_bytes, max_height, pick_quality
+
+
+class JsonLinesWriter:
+    """Écrit un événement JSON par ligne, sans mélanger les threads."""
+
+    def __init__(self, stream=sys.stdout):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields):
+        line = json.dumps({"event": event, "time": round(time.time(), 3), **fields})
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def read_urls(path: str) -> list[str]:
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with source:
+        return [
+            line.strip()
+            for line in source
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def _pump_progress(channel, urls, writer, stop, interval):
+    # Vide le canal partagé (dernier état par entrée, débit limité)
+    while True:
+        for (scope, entry), state in channel.drain().items():
+            writer.emit("progress", url=urls[scope], entry=entry, **state)
+        if stop.is_set() and channel.empty():
+            return
+        time.sleep(interval)
+
+
+def _budget_quality(media, args) -> str | None:
+    """Qualité imposée par --max-size / --max-minutes, plafonnée par --quality."""
+    budget = budget_bytes(args.max_size, args.max_minutes)
+    if budget is None:
+        return None
+    # Même plafond que le sélecteur de formats ("4k" compris)
+    cap = max_height(args.quality)
+    options = [o for o in media.quality_options if o.height <= cap]
+    option = pick_quality(options, budget)
+    return option.label if option else None
+
+
+def run_batch(args) -> int:
+    writer = JsonLinesWriter()
+    service = YouTubeService(prefetch_thumbnails=False)
+    channel = ProgressChannel(max_rate=args.rate)
+    scheduler = DownloadScheduler(args.concurrency)
+    urls = read_urls(args.file)
+
+    completions = {}  # id(media) -> Future du post-traitement
+
+    def download(media, progress):
+        # Le worker passe au suivant pendant la fusion (étage de post-traitement)
+        # quiet : stdout ne reçoit que les événements JSON (messages sur stderr)
+        completions[id(media)] = Engine(
+            media, progress, output_dir=args.output, quiet=True
+        ).download_media(wait=False)
+
+    tasks = []
+    for scope, url in enumerate(urls):
+        try:
+            media = service.analyze_url(url)
+        except Exception as e:
+            writer.emit("error", url=url, stage="analyse", message=str(e))
+            continue
+        if hasattr(media, "resol_selected"):
+            media.resol_selected = _budget_quality(media, args) or args.quality
+        writer.emit(
+            "queued", url=url, id=media.id, title=media.title,
+            quality=getattr(media, "resol_selected", None),
+        )
+        tasks.append((url, scheduler.submit(media, channel.scoped(scope), download)))
+
+    stop = threading.Event()
+    pump = threading.Thread(
+        target=_pump_progress, args=(channel, urls, writer, stop, 1.0 / args.rate)
+    )
+    pump.start()
+    scheduler.wait()
+    for done in list(completions.values()):
+        done.exception()  # Attend la fin, sans lever
+    stop.set()
+    pump.join()
+
+    failures = len(urls) - len(tasks)
+    for url, task in tasks:
+        done = completions.get(id(task.media))
+        if task.error is None and done is not None:
+            task.error = done.exception()
+        if task.error is None:
+            writer.emit("done", url=url, id=task.media.id)
+        else:
+            failures += 1
+            writer.emit("error", url=url, stage="download", message=str(task.error))
+    writer.emit("summary", total=len(urls), failed=failures)
+    return 1 if failures else 0
+
+
+def _positive_float(value: str) -> float:
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"doit être strictement positif : {value}")
+    return number
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="tubedl", description="TubeDL en ligne de commande")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="télécharger une liste d'URL")
+    batch.add_argument("file", help="fichier d'URL, une par ligne ('-' = stdin)")
+    batch.add_argument("-j", "--concurrency", type=int, default=3,
+                       help="téléchargements simultanés (défaut : 3)")
+    batch.add_argument("-q", "--quality", default="1080p",
+                       help="qualité maximale : 4k, 1440p, 1080p, 720p... (défaut : 1080p)")
+    batch.add_argument("--max-size", type=float, default=None, metavar="MO",
+                       help="meilleure qualité dont la taille estimée tient en MO mégaoctets")
+    batch.add_argument("--max-minutes", type=float, default=None, metavar="MIN",
+                       help="meilleure qualité téléchargeable en MIN minutes au débit mesuré")
+    batch.add_argument("-o", "--output", default=None,
+                       help="dossier de destination (défaut : celui des paramètres)")
+    batch.add_argument("--rate", type=_positive_float, default=2.0,
+                       help="événements de progression par seconde et par entrée")
+    batch.set_defaults(func=run_batch)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,38 @@
+from functools import partial
 from services import YouTubeService
-from services import Engine
+from services import Engine, DownloadScheduler, AnalysisExecutor, ProgressChannel
+from services import WarmUp, get_download_journal, get_bandwidth_manager
+from services import budget_bytes, pick_quality, get_postprocessing_stage
+from services.journal import RUNNING, DONE, FAILED, PARTIAL
+from core import AppSettings
 from controllers.decorators import handle_error
 
+_scheduler = None
+_analysis = None
+_progress = None
+_warmup = None
+
+
+def _get_scheduler() -> DownloadScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = DownloadScheduler(AppSettings.load_max_downloads())
+    return _scheduler
+
+
+def _get_analysis() -> AnalysisExecutor:
+    global _analysis
+    if _analysis is None:
+        _analysis = AnalysisExecutor()
+    return _analysis
+
+
+def _get_progress() -> ProgressChannel:
+    global _progress
+    if _progress is None:
+        _progress = ProgressChannel()
+    return _progress
+
 
 class Controller:
     @staticmethod
@@ -10,8 +41,146 @@ class Controller:
         yt_service = YouTubeService()
         return yt_service.analyze_url(url)
 
+    @staticmethod
+    def analyse_url_async(url):
+        """Retourne un Future ; à consommer depuis le thread Tk."""
+        return _get_analysis().submit(url, YouTubeService().analyze_url)
+
+    @staticmethod
+    def is_current_analysis(future):
+        return _get_analysis().is_current(future)
+
     @staticmethod
     @handle_error
-    def download(media, queue):
-        downloader = Engine(media, queue)
-        downloader.download_media()
+    def download(media, progress, priority=0, entry=None):
+        """
+        Met un téléchargement en file. `entry` : élément déjà journalisé
+        (reprise après redémarrage), sinon il est ajouté au journal.
+        """
+        if entry is None:
+            output_dir = AppSettings.load_download_folder()
+            entry_id = get_download_journal().add(
+                media, getattr(media, "resol_selected", None), output_dir
+            )
+        else:
+            entry_id, output_dir = entry["id"], entry["output_dir"]
+        target = partial(
+            Controller._run_download, entry_id=entry_id, output_dir=output_dir
+        )
+        return _get_scheduler().submit(media, progress, target, priority)
+
+    @staticmethod
+    def pending_downloads():
+        """Éléments du journal interrompus lors de la session précédente."""
+        return get_download_journal().unfinished()
+
+    @staticmethod
+    def progress_channel():
+        """Canal partagé par tous les téléchargements (multiplexé par scope)."""
+        return _get_progress()
+
+    @staticmethod
+    def _run_download(media, progress, entry_id=None, output_dir=None):
+        journal = get_download_journal()
+        journal.mark(entry_id, RUNNING)
+        try:
+            # Même dossier qu'à la mise en file : les .part y sont repris.
+            # Le worker est libéré dès que les flux sont sur le disque.
+            done = Engine(media, progress, output_dir).download_media(wait=False)
+        except Exception as e:
+            journal.mark(entry_id, FAILED, str(e))
+            # Le message d'erreur est affiché par la vue, sur le thread Tk
+            Controller._publish_terminal(progress, "error", e)
+            raise
+        done.add_done_callback(
+            partial(Controller._download_finished, entry_id, media, progress)
+        )
+
+    @staticmethod
+    def _download_finished(entry_id, media, progress, done):
+        """Fin du post-traitement (fusion, déplacement) d'un élément."""
+        journal = get_download_journal()
+        if done.exception() is not None:
+            journal.mark(entry_id, FAILED, str(done.exception()))
+            Controller._publish_terminal(progress, "error", done.exception())
+            return
+        # Playlist : entrées en échec (indisponibles, fusion ratée...)
+        failed = done.result()
+        if not failed:
+            journal.mark(entry_id, DONE)
+            Controller._publish_terminal(progress, "finished")
+            return
+        error = f"{failed} vidéo(s) sur {media.count} en échec"
+        status = FAILED if failed >= media.count else PARTIAL
+        journal.mark(entry_id, status, error)
+        Controller._publish_terminal(
+            progress, "error" if status == FAILED else "partial", error
+        )
+
+    @staticmethod
+    def _publish_terminal(progress, status: str, error: Exception | str | None = None):
+        """État final de tout l'élément : la carte s'arrête même sans entrée finie."""
+        if progress is not None:
+            state = {"status": status, "percent": 1.0, "terminal": True}
+            if error is not None:
+                state["error"] = str(error)
+            progress.publish("item", state)
+
+    @staticmethod
+    def start_warmup():
+        """Préchauffe yt-dlp, cookies et connexions en arrière-plan."""
+        global _warmup
+        if _warmup is None:
+            _warmup = WarmUp()
+            _warmup.start()
+        return _warmup
+
+    @staticmethod
+    def cancel_warmup():
+        if _warmup is not None:
+            _warmup.cancel()
+
+    @staticmethod
+    def pause_downloads():
+        _get_scheduler().pause()
+
+    @staticmethod
+    def downloads_paused() -> bool:
+        return _get_scheduler().paused
+
+    @staticmethod
+    def resume_downloads():
+        _get_scheduler().resume()
+
+    @staticmethod
+    def bump_download(task):
+        _get_scheduler().bump(task)
+
+    @staticmethod
+    def set_bandwidth(limit: int, per_download: int):
+        """Limites en Ko/s (0 = illimité), appliquées aux téléchargements en cours."""
+        AppSettings.save_bandwidth(limit, per_download)
+        get_bandwidth_manager().configure(limit, per_download)
+
+    @staticmethod
+    def quality_for_budget(options, max_mb=None, max_minutes=None):
+        """
+        Qualité (QualityOption) retenue par une politique de budget : taille
+        maximale en Mo et/ou durée maximale au débit actuel. None si le budget
+        ne peut pas être évalué (débit inconnu, tailles inconnues).
+        """
+        budget = budget_bytes(max_mb, max_minutes)
+        if budget is None:
+            return None
+        return pick_quality(options, budget)
+
+    @staticmethod
+    def set_max_downloads(value: int):
+        AppSettings.save_max_downloads(value)
+        _get_scheduler().set_max_workers(value)
+
+    @staticmethod
+    def set_postprocess_workers(value: int):
+        """Fusions ffmpeg simultanées, indépendamment des téléchargements."""
+        AppSettings.save_postprocess_workers(value)
+        get_postprocessing_stage().set_max_workers(value)
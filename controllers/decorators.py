@@ -2,6 +2,14 @@ from CTkMessagebox import CTkMessagebox
 from functools import wraps
 
 
+def show_error(e: Exception):
+    CTkMessagebox(
+        title="Error",
+        message=f"Erreur inattendu\n{str(e)}",
+        icon="cancel",
+    )
+
+
 def handle_error(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -9,10 +17,6 @@ def handle_error(func):
             res = func(*args, **kwargs)
             return res
         except Exception as e:
-            CTkMessagebox(
-                title="Error",
-                message=f"Erreur inattendu\n{str(e)}",
-                icon="cancel",
-            )
+            show_error(e)
             return
     return wrapper
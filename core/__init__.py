@@ -1,5 +1,6 @@
 from .app_config import AppConfig
 from .app_settings import AppSettings
 from .ressource import setup_check
+from .paths import user_cache_dir, user_config_dir
 
-__all__ = ["AppConfig", "AppSettings", "setup_check"]
+__all__ = ["AppConfig", "AppSettings", "setup_check", "user_cache_dir", "user_config_dir"]
@@ -1,27 +1,91 @@
+import atexit
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
+from .paths import user_config_dir
 
 
 class AppSettings:
-    FILE_PATH = "settings.json"
+    """
+    Paramètres gardés en mémoire : le fichier n'est relu que si son mtime
+    change, et les écritures sont regroupées puis faites de façon atomique.
+    """
+
+    FILE_PATH = None  # Résolu au premier accès (dossier de config utilisateur)
+    LEGACY_PATH = "settings.json"  # Ancien emplacement (dossier courant)
+    FLUSH_DELAY = 0.5  # secondes
+
+    _cache = None
+    _mtime = None
+    _timer = None
+    _lock = threading.RLock()
 
     @staticmethod
-    def _load() -> dict:
-        if not os.path.exists(AppSettings.FILE_PATH):
+    def _path() -> str:
+        if AppSettings.FILE_PATH is None:
+            AppSettings.FILE_PATH = str(user_config_dir() / "settings.json")
+        return AppSettings.FILE_PATH
+
+    @staticmethod
+    def _read(path: str) -> dict:
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
             return {}
-        with open(AppSettings.FILE_PATH, "r") as f:
+
+    @staticmethod
+    def _load() -> dict:
+        with AppSettings._lock:
+            path = AppSettings._path()
             try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = None
+
+            # Une écriture en attente prime sur le fichier
+            if AppSettings._cache is None or (
+                mtime != AppSettings._mtime and AppSettings._timer is None
+            ):
+                if mtime is None and os.path.exists(AppSettings.LEGACY_PATH):
+                    AppSettings._cache = AppSettings._read(AppSettings.LEGACY_PATH)
+                else:
+                    AppSettings._cache = AppSettings._read(path)
+                AppSettings._mtime = mtime
+            return AppSettings._cache
 
     @staticmethod
     def _save(data: dict):
-        settings = AppSettings._load()
-        settings.update(data)
-        with open(AppSettings.FILE_PATH, "w") as f:
-            json.dump(settings, f, indent=4)
+        with AppSettings._lock:
+            AppSettings._load().update(data)
+            if AppSettings._timer is None:
+                AppSettings._timer = threading.Timer(
+                    AppSettings.FLUSH_DELAY, AppSettings.flush
+                )
+                AppSettings._timer.daemon = True
+                AppSettings._timer.start()
+
+    @staticmethod
+    def flush():
+        """Écrit les paramètres en attente (fichier temporaire puis rename)."""
+        with AppSettings._lock:
+            if AppSettings._timer is not None:
+                AppSettings._timer.cancel()
+                AppSettings._timer = None
+            if AppSettings._cache is None:
+                return
+            path = AppSettings._path()
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(AppSettings._cache, f, indent=4)
+                os.replace(tmp, path)
+            except OSError:
+                os.unlink(tmp)
+                raise
+            AppSettings._mtime = os.stat(path).st_mtime_ns
 
     @staticmethod
     def save_folder_path(path: str):
@@ -35,6 +99,26 @@ class AppSettings:
     def save_theme(theme: str):
         AppSettings._save({"theme": theme})
 
+    @staticmethod
+    def save_max_downloads(value: int):
+        AppSettings._save({"max_concurrent_downloads": value})
+
+    @staticmethod
+    def save_postprocess_workers(value: int):
+        AppSettings._save({"postprocess_workers": value})
+
+    @staticmethod
+    def save_metadata_cache(enabled: bool):
+        AppSettings._save({"metadata_cache": enabled})
+
+    @staticmethod
+    def save_playlist_workers(value: int):
+        AppSettings._save({"playlist_workers": value})
+
+    @staticmethod
+    def save_bandwidth(limit: int, per_download: int):
+        AppSettings._save({"bandwidth_limit": limit, "bandwidth_per_download": per_download})
+
     @staticmethod
     def load_download_folder() -> str:
         return AppSettings._load().get("download_folder", str(Path.home() / "Downloads"))
@@ -46,3 +130,54 @@ class AppSettings:
     @staticmethod
     def load_default_theme() -> str:
         return AppSettings._load().get("theme", "system")
+
+    @staticmethod
+    def load_max_downloads() -> int:
+        return AppSettings._load().get("max_concurrent_downloads", 3)
+
+    @staticmethod
+    def load_postprocess_workers() -> int:
+        return AppSettings._load().get("postprocess_workers", 1)
+
+    @staticmethod
+    def load_metadata_cache() -> bool:
+        return AppSettings._load().get("metadata_cache", True)
+
+    @staticmethod
+    def load_playlist_workers() -> int:
+        return AppSettings._load().get("playlist_workers", 3)
+
+    @staticmethod
+    def load_adaptive_transfer() -> bool:
+        return AppSettings._load().get("adaptive_transfer", True)
+
+    @staticmethod
+    def load_fragment_downloads_bounds() -> list:
+        return AppSettings._load().get("fragment_downloads_bounds", [1, 8])
+
+    @staticmethod
+    def load_http_chunk_mb_bounds() -> list:
+        return AppSettings._load().get("http_chunk_mb_bounds", [1, 32])
+
+    @staticmethod
+    def load_metrics_export() -> str:
+        return AppSettings._load().get("metrics_export", "jsonl")
+
+    @staticmethod
+    def load_metrics_dir() -> str:
+        return AppSettings._load().get("metrics_dir", "")
+
+    @staticmethod
+    def load_bandwidth_limit() -> int:
+        return AppSettings._load().get("bandwidth_limit", 0)
+
+    @staticmethod
+    def load_bandwidth_per_download() -> int:
+        return AppSettings._load().get("bandwidth_per_download", 0)
+
+    @staticmethod
+    def load_bandwidth_schedule() -> list:
+        return AppSettings._load().get("bandwidth_schedule", [])
+
+
+atexit.register(AppSettings.flush)
@@ -0,0 +1,34 @@
+import os
+import platform
+from pathlib import Path
+from .app_config import AppConfig
+
+
+def user_cache_dir() -> Path:
+    """Dossier de cache propre à l'utilisateur (créé au besoin)."""
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local"))
+        path = base / AppConfig.APP_NAME / "Cache"
+    elif system == "Darwin":
+        path = Path.home() / "Library/Caches" / AppConfig.APP_NAME
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+        path = base / AppConfig.APP_NAME.lower()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def user_config_dir() -> Path:
+    """Dossier de configuration propre à l'utilisateur (créé au besoin)."""
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.environ.get("APPDATA", Path.home() / "AppData/Roaming"))
+        path = base / AppConfig.APP_NAME
+    elif system == "Darwin":
+        path = Path.home() / "Library/Application Support" / AppConfig.APP_NAME
+    else:
+        base = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+        path = base / AppConfig.APP_NAME.lower()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,6 +1,13 @@
+import sys
+
+# Mode batch headless : aucune vue (ni Tk) n'est importée
+if len(sys.argv) > 1 and sys.argv[1] == "batch":
+    from cli import main
+
+    sys.exit(main(sys.argv[1:]))
+
 from views import App, Launcher
 from core import setup_check
-import sys
 
 # setup_startup = setup_check()
 # if not setup_startup:
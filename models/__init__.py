@@ -1,3 +1,4 @@
 from .video import Video
 from .short import Short
 from .playlist import Playlist
+from .queue_item import QueueItem
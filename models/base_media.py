@@ -1,6 +1,4 @@
-from PIL import Image
-import requests
-from io import BytesIO
+from utils.thumbnails import CARD_SIZE, fallback_image, get_thumbnail_loader
 
 
 class BaseMedia:
@@ -9,18 +7,11 @@ class BaseMedia:
         self.title = title
         self.url = url
         self.thumbnail = thumbnail
-        self.pil_thumbnail = self.load_thumbnail()
 
-    def load_thumbnail(self):
-        try:
-            response = requests.get(self.thumbnail, timeout=5)
-            response.raise_for_status()
+    def load_thumbnail(self, size=CARD_SIZE):
+        """Future de la miniature ; aucune requête tant qu'elle n'est pas demandée."""
+        return get_thumbnail_loader().get(self.id, self.thumbnail, size)
 
-            img = Image.open(BytesIO(response.content))
-            img.verify()  # vérifie que c'est bien une image
-
-            # Re-open after verify (PIL trick)
-            return Image.open(BytesIO(response.content)).convert("RGB")
-
-        except Exception as e:
-            return Image.open("assets/image/fallback.png").convert("RGB")
+    def cached_thumbnail(self, size=CARD_SIZE):
+        """Miniature déjà chargée, ou l'image de repli."""
+        return get_thumbnail_loader().get_cached(self.id, size) or fallback_image()
@@ -5,3 +5,14 @@ class Playlist(BaseMedia):
     def __init__(self, id, title, url, count, thumbnail):
         super().__init__(id, title, url, thumbnail)
         self.count = count
+        # Remplis au fil de l'analyse (listing paginé en arrière-plan)
+        self.entries = []
+        self.complete = False
+        # True seulement si le listing de l'analyse est allé jusqu'au bout
+        self.listed = False
+        # Champs de la playlist (extracteur, titre...), sans les entrées
+        self.info = {}
+
+    def add_entry(self, entry: dict):
+        self.entries.append(entry)
+        self.count = max(self.count, len(self.entries))
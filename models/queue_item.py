@@ -0,0 +1,77 @@
+from models.playlist import Playlist
+
+_FINAL_STATUSES = ("finished", "error")
+
+
+class QueueItem:
+    """
+    Élément de la file de téléchargement, indépendant de tout widget :
+    la vue virtualisée n'affiche que les éléments visibles.
+    """
+
+    def __init__(self, media, quality=None):
+        self.media = media
+        self.quality = quality
+        self.is_playlist = isinstance(media, Playlist)
+        self.count = max(getattr(media, "count", 1), 1)
+        self.task = None
+
+        self.percent = 0.0  # avancement global (0..1)
+        self.current_video = 1
+        self.current_percent = 0.0
+        self.speed = None
+        self.status = "pending"
+        self.postprocessor = None  # étape de post-traitement en cours (Merger...)
+        self.finished = 0  # entrées de playlist téléchargées
+        self.error = None  # message d'échec de tout l'élément
+        self.done = False
+        self._entries_progress = {}  # playlist_index -> avancement (0..1)
+        self._entries_failed = set()  # playlist_index des entrées en échec
+
+    def apply(self, updates: list[dict]) -> bool:
+        """Intègre les états reçus du canal de progression ; True = terminé."""
+        # État final de tout l'élément, publié par le contrôleur en dernier
+        # (avec le message d'échec) : seul lui termine la carte, sinon le
+        # dispatcher cesserait d'écouter avant de le recevoir
+        terminal = next((d for d in updates if d.get("terminal")), None)
+        updates = [d for d in updates if not d.get("terminal")]
+        if updates:
+            self._apply_entries(updates)
+        if terminal is not None:
+            self.status = terminal["status"]
+            self.error = terminal.get("error")
+            if self.status != "error":
+                self.percent = 1.0
+            self.done = True
+        return self.done
+
+    def _apply_entries(self, updates: list[dict]):
+        for data in updates:
+            current_video = data.get("current_video") or 1
+            # Le listing de l'analyse a pu être partiel : l'Engine connaît le total
+            if self.is_playlist:
+                self.count = max(self.count, data.get("total") or 0, 1)
+            # Les entrées d'une playlist peuvent progresser en parallèle ; une
+            # entrée en post-traitement n'est pas encore terminée
+            self._entries_progress[current_video] = (
+                1.0 if data.get("status") in _FINAL_STATUSES else min(data["percent"], 0.99)
+            )
+            if data.get("status") == "error":
+                self._entries_failed.add(current_video)
+            else:
+                self._entries_failed.discard(current_video)
+
+        data = updates[-1]
+        self.current_video = data.get("current_video") or 1
+        self.current_percent = data["percent"]
+        self.speed = data.get("speed")
+        self.status = data.get("status", "downloading")
+        self.postprocessor = data.get("postprocessor")
+
+        if self.is_playlist:
+            self.percent = sum(self._entries_progress.values()) / self.count
+            self.finished = sum(
+                1 for p in self._entries_progress.values() if p >= 1
+            ) - len(self._entries_failed)
+        else:
+            self.percent = self.current_percent
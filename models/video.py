@@ -10,8 +10,13 @@ class Video(BaseMedia):
         thumbnail,
         duration,
         res_list=[],
+        quality_options=None,
     ):
         super().__init__(id, title, url, thumbnail)
         self.res_list = res_list
+        # QualityOption (taille estimée par qualité), absentes après reprise du journal
+        self.quality_options = quality_options or []
+        # info_dict de l'analyse : l'Engine en repart sans nouvelle extraction
+        self.info = None
         self.resol_selected = None
         self.duration = duration
@@ -1,3 +1,13 @@
 from .engine import Engine
 from .youtube_service import YouTubeService
-from .helpers import get_format_selector
+from .helpers import get_format_selector, max_height
+from .scheduler import DownloadScheduler, DownloadTask, TaskState
+from .analysis import AnalysisExecutor
+from .progress import ProgressChannel
+from .ydl_pool import YDLPool, get_ydl_pool
+from .warmup import WarmUp
+from .journal import DownloadJournal, get_download_journal
+from .bandwidth import BandwidthManager, get_bandwidth_manager
+from .metrics import MetricsRegistry, PhaseRecorder, get_metrics_registry
+from .postprocessing import PostProcessingStage, get_postprocessing_stage
+from .format_ranking import QualityOption, rank_formats, budget_bytes, pick_quality
@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .helpers import clean_url
+
+
+class AnalysisExecutor:
+    """
+    Exécute les analyses d'URL hors du thread Tk.
+    - une même URL déjà en cours d'analyse partage le même Future
+    - une nouvelle URL annule l'analyse précédente encore en attente
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="analyse")
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+        self._current: Future | None = None
+
+    def submit(self, url: str, fn) -> Future:
+        key = clean_url(url)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(fn, key)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f, k=key: self._forget(k, f))
+
+            if self._current is not None and self._current is not future:
+                # Un Future déjà lancé ne peut pas être interrompu :
+                # son résultat sera simplement ignoré par l'appelant.
+                self._current.cancel()
+            self._current = future
+        return future
+
+    def is_current(self, future: Future) -> bool:
+        return future is self._current
+
+    def _forget(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
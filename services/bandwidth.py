@@ -0,0 +1,158 @@
+import threading
+import time
+from datetime import datetime
+from core import AppSettings
+
+KIB = 1024
+
+
+def _minutes(hhmm: str) -> int:
+    hours, minutes = hhmm.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def scheduled_limit(schedule: list[dict], default: int, now: datetime | None = None) -> int:
+    """
+    Limite (Ko/s) en vigueur : la première plage horaire qui contient `now`,
+    sinon `default`. Une plage peut passer minuit ("23:00" -> "07:00").
+    """
+    now = now or datetime.now()
+    current = now.hour * 60 + now.minute
+    for rule in schedule or []:
+        try:
+            start, end = _minutes(rule["from"]), _minutes(rule["to"])
+        except (KeyError, ValueError, AttributeError):
+            continue
+        inside = start <= current < end if start <= end else (current >= start or current < end)
+        if inside:
+            return rule.get("limit", 0)
+    return default
+
+
+class _VirtualClock:
+    """Seau à jetons exprimé en temps : chaque octet réserve 1/rate seconde."""
+
+    def __init__(self, burst: float):
+        self.burst = burst
+        self.next = 0.0
+
+    def reserve(self, nbytes: int, rate: float, now: float) -> float:
+        # Un débit inutilisé reste disponible au plus `burst` secondes
+        start = max(now - self.burst, self.next)
+        self.next = start + nbytes / rate
+        return self.next - now
+
+    def reset(self):
+        self.next = 0.0
+
+
+class BandwidthStream:
+    """Part du débit d'un téléchargement (un élément de la file)."""
+
+    def __init__(self, manager: "BandwidthManager"):
+        self._manager = manager
+        self._clock = _VirtualClock(manager.burst)
+        self._seen: dict = {}
+
+    def consume(self, nbytes: int):
+        if nbytes > 0:
+            self._manager._consume(self, nbytes)
+
+    def consume_progress(self, d: dict):
+        """
+        Prélève les octets reçus depuis le dernier hook de progression du
+        même fichier. Le premier hook sert de référence (reprise d'un .part).
+        """
+        key = d.get("tmpfilename") or d.get("filename")
+        downloaded = d.get("downloaded_bytes") or 0
+        last = self._seen.get(key)
+        self._seen[key] = downloaded
+        if last is not None:
+            self.consume(downloaded - last)
+
+    def close(self):
+        self._manager._release(self)
+
+
+class BandwidthManager:
+    """
+    Limiteur de débit commun à tous les Engine du processus. Les
+    téléchargements prélèvent leurs octets sur un même seau (réservations
+    dans l'ordre d'arrivée, donc partage équitable entre éléments), avec un
+    plafond optionnel par téléchargement et une plage horaire (ex. illimité
+    la nuit). configure() s'applique aux téléchargements en cours.
+    """
+
+    def __init__(self, limit: int = 0, per_download: int = 0, schedule=None, burst: float = 0.5):
+        self.burst = burst
+        self._cond = threading.Condition()
+        self._clock = _VirtualClock(burst)
+        self._streams: set[BandwidthStream] = set()
+        self.configure(limit, per_download, schedule or [])
+
+    def configure(self, limit=None, per_download=None, schedule=None):
+        """Limites en Ko/s (0 = illimité)."""
+        with self._cond:
+            if limit is not None:
+                self.limit = max(0, int(limit))
+            if per_download is not None:
+                self.per_download = max(0, int(per_download))
+            if schedule is not None:
+                self.schedule = schedule
+            # Les dettes accumulées sous l'ancienne limite sont effacées
+            self._clock.reset()
+            for stream in self._streams:
+                stream._clock.reset()
+            self._cond.notify_all()
+
+    def current_limit(self) -> int:
+        """Limite globale en vigueur (Ko/s), plage horaire comprise."""
+        return scheduled_limit(self.schedule, self.limit)
+
+    def stream(self) -> BandwidthStream:
+        stream = BandwidthStream(self)
+        with self._cond:
+            self._streams.add(stream)
+        return stream
+
+    @property
+    def limited(self) -> bool:
+        """Un plafond (global ou par téléchargement) est en vigueur."""
+        return bool(self.current_limit() or self.per_download)
+
+    @property
+    def active(self) -> int:
+        return len(self._streams)
+
+    def _release(self, stream):
+        with self._cond:
+            self._streams.discard(stream)
+
+    def _consume(self, stream: BandwidthStream, nbytes: int):
+        with self._cond:
+            now = time.monotonic()
+            delay = 0.0
+            limit = self.current_limit()
+            if limit:
+                delay = self._clock.reserve(nbytes, limit * KIB, now)
+            if self.per_download:
+                delay = max(delay, stream._clock.reserve(nbytes, self.per_download * KIB, now))
+            if delay > 0:
+                # Réveil anticipé si la limite change entre-temps
+                self._cond.wait(delay)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_bandwidth_manager() -> BandwidthManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BandwidthManager(
+                AppSettings.load_bandwidth_limit(),
+                AppSettings.load_bandwidth_per_download(),
+                AppSettings.load_bandwidth_schedule(),
+            )
+    return _manager
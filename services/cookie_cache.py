@@ -0,0 +1,129 @@
+import os
+import platform
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from core import user_cache_dir
+
+# Messages yt-dlp indiquant des cookies absents ou périmés
+_AUTH_MARKERS = (
+    "sign in to confirm",
+    "use --cookies",
+    "login required",
+    "private video",
+    "members-only",
+)
+
+
+def _browser_dir(browser: str) -> Path | None:
+    if browser != "chrome":
+        return None
+    system = platform.system()
+    if system == "Windows":
+        return Path(os.environ.get("LOCALAPPDATA", "")) / "Google/Chrome/User Data"
+    if system == "Darwin":
+        return Path.home() / "Library/Application Support/Google/Chrome"
+    base = Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+    return base / "google-chrome"
+
+
+class BrowserCookieCache:
+    """
+    Extrait une seule fois les cookies du navigateur dans un fichier Netscape
+    privé, réutilisé par l'analyse et les téléchargements. Nouvelle extraction
+    uniquement si la base de cookies du navigateur change, ou après un échec
+    d'authentification (invalidate()).
+    """
+
+    def __init__(self, browser: str = "chrome"):
+        self.browser = browser
+        self._dir = user_cache_dir() / "cookies"
+        self._dir.mkdir(mode=0o700, exist_ok=True)
+        self._lock = threading.Lock()
+        self._source_mtime = None
+        self._jar_path = None
+        self._users = Counter()  # jar -> instances YoutubeDL qui le lisent
+        self._fresh = False
+        self.extractions = 0
+
+    def get_cookiefile(self) -> str | None:
+        """Chemin du jar privé, ou None si l'extraction est impossible."""
+        with self._lock:
+            mtime = self._browser_db_mtime()
+            if not self._fresh or mtime != self._source_mtime:
+                try:
+                    self._jar_path = self._extract(mtime)
+                except Exception as e:
+                    # Navigateur absent, trousseau verrouillé... : on ne
+                    # réessaie qu'au prochain changement de la base
+                    print(f"⚠ Cookies {self.browser} indisponibles : {e}", file=sys.stderr)
+                    self._jar_path = None
+                self._source_mtime = mtime
+                self._fresh = True
+                self._reap()
+            return str(self._jar_path) if self._jar_path else None
+
+    def invalidate(self):
+        with self._lock:
+            self._fresh = False
+
+    def retain(self, path: str | None):
+        """Une instance YoutubeDL lit (et réécrira à sa fermeture) ce jar."""
+        if path is None:
+            return
+        with self._lock:
+            self._users[path] += 1
+
+    def release(self, path: str | None):
+        if path is None:
+            return
+        with self._lock:
+            self._users[path] -= 1
+            if self._users[path] <= 0:
+                del self._users[path]
+                self._reap()
+
+    def _reap(self):
+        # Anciennes générations qu'aucune instance n'utilise plus
+        for old in self._dir.glob(f"{self.browser}-*.txt"):
+            if old != self._jar_path and str(old) not in self._users:
+                old.unlink(missing_ok=True)
+
+    def _browser_db_mtime(self):
+        root = _browser_dir(self.browser)
+        if root is None or not root.is_dir():
+            return None
+        # Profil le plus récemment utilisé (Default/Cookies, Default/Network/Cookies...)
+        mtimes = [p.stat().st_mtime_ns for p in root.glob("*/Cookies")]
+        mtimes += [p.stat().st_mtime_ns for p in root.glob("*/Network/Cookies")]
+        return max(mtimes, default=None)
+
+    def _extract(self, mtime) -> Path:
+        from yt_dlp.cookies import extract_cookies_from_browser
+
+        jar = extract_cookies_from_browser(self.browser)
+        self.extractions += 1
+        # Un fichier par génération : les instances YoutubeDL qui lisent
+        # encore l'ancien le gardent (retain) jusqu'à leur passage au nouveau
+        path = self._dir / f"{self.browser}-{mtime or 0}-{self.extractions}.txt"
+        jar.save(str(path))
+        os.chmod(path, 0o600)
+        return path
+
+
+def is_auth_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in _AUTH_MARKERS)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cookie_cache() -> BrowserCookieCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = BrowserCookieCache()
+        return _cache
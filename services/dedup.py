@@ -0,0 +1,89 @@
+import os
+import shutil
+import threading
+
+
+def link_or_copy(source: str, target: str):
+    """Lien physique vers `source` ; copie si le système de fichiers refuse."""
+    if os.path.exists(target):
+        return
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        # Autre volume, FAT/exFAT... : copie classique
+        shutil.copy2(source, target)
+
+
+def downloaded_path(info: dict) -> str | None:
+    """Chemin final (après fusion) d'un info_dict renvoyé par yt-dlp."""
+    downloads = info.get("requested_downloads") or []
+    if downloads and downloads[-1].get("filepath"):
+        return downloads[-1]["filepath"]
+    return info.get("filepath")
+
+
+class _Flight:
+    def __init__(self):
+        self.event = threading.Event()
+        self.path = None
+
+
+class Claim:
+    def __init__(self, registry, key, flight, owner: bool):
+        self._registry = registry
+        self._key = key
+        self._flight = flight
+        self.owner = owner
+
+    def wait(self) -> str | None:
+        """Attend le téléchargement en cours ; None s'il a échoué."""
+        self._flight.event.wait()
+        return self._flight.path
+
+    def resolve(self, path: str | None):
+        self._registry._finish(self._key, self._flight, path)
+
+    def fail(self):
+        self._registry._finish(self._key, self._flight, None)
+
+
+class DedupRegistry:
+    """
+    Téléchargements identiques (même id, même format) partagés entre toutes
+    les files : le premier demandeur télécharge, les suivants attendent le
+    même fichier puis le lient (ou le copient) vers leur propre destination.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, _Flight] = {}
+
+    def claim(self, media_id: str, format_selector: str | None) -> Claim:
+        key = (media_id, format_selector)
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and (
+                not flight.event.is_set()
+                or (flight.path and os.path.exists(flight.path))
+            ):
+                return Claim(self, key, flight, owner=False)
+            # Premier demandeur, ou fichier précédent supprimé depuis
+            flight = self._flights[key] = _Flight()
+            return Claim(self, key, flight, owner=True)
+
+    def _finish(self, key, flight, path):
+        with self._lock:
+            flight.path = path
+            if path is None and self._flights.get(key) is flight:
+                # Échec : le prochain demandeur retentera le téléchargement
+                del self._flights[key]
+        flight.event.set()
+
+
+# Créé à l'import : deux registres concurrents annuleraient le partage
+_registry = DedupRegistry()
+
+
+def get_dedup_registry() -> DedupRegistry:
+    return _registry
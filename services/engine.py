@@ -1,35 +1,163 @@
-import re
 import os
-from queue import Queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import shutil
-import yt_dlp
 from core import AppSettings, AppConfig
 from models.playlist import Playlist
 from models.short import Short
 from models.video import Video
-from .helpers import get_format_selector, load_cookie
-
-
-def _strip_ansi(text: str) -> str:
-    return re.sub(r"\x1b\[[0-9;]*m", "", text)
+from .bandwidth import get_bandwidth_manager
+from .dedup import downloaded_path, get_dedup_registry, link_or_copy
+from .helpers import get_format_selector, load_cookie, refresh_browser_cookies
+from .helpers import is_info_fresh
+from .cookie_cache import is_auth_error
+from .metrics import PhaseRecorder, YDLMetrics
+from .postprocessing import get_postprocessing_stage, when_all
+from .progress import ProgressChannel
+from .transfer_tuning import get_transfer_tuner
+from .ydl_pool import get_ydl_pool
 
 
 class Engine:
-    def __init__(self, media: Video | Short | Playlist, queue: Queue):
+    def __init__(
+        self,
+        media: Video | Short | Playlist,
+        progress: ProgressChannel | None,
+        output_dir: str | None = None,
+        quiet: bool = False,
+    ):
         self.media = media
-        self.queue = queue
+        self.progress = progress
+        self.output_dir = output_dir or AppSettings.load_download_folder()
+        self.playlist_workers = AppSettings.load_playlist_workers()
+        self.timings = {}  # durées mesurées (secondes), par étape
+        self.bandwidth = None
+        # Réglages de transfert adaptatifs (None = valeurs par défaut de yt-dlp)
+        self.tuner = get_transfer_tuner()
+        self._transfer = {}  # current_video -> options utilisées
+        # Durées par phase et compteurs, exportés à la fin du téléchargement
+        self.recorder = PhaseRecorder(
+            "download", kind=type(media).__name__.lower(), media_id=media.id
+        )
+        self._metrics = YDLMetrics(self.recorder)
+        # Post-traitements confiés à l'étage dédié (un Future par fichier)
+        self._postprocessing = []
+        self._entry_postprocessing = {}  # current_video -> Future
+        self._failed_entries = set()  # playlist_index des entrées en échec
         self.ydl_opts = {
             "format": "bestvideo[ext=mp4][vcodec^=avc1]+bestaudio[ext=m4a]/bestvideo+bestaudio/best",
             "merge_output_format": "mp4",
             "ffmpeg_location": AppConfig.FFMPEG_BINARY_DIR,
-            "quiet": False,
+            # Mode batch : la sortie standard est réservée aux événements JSON,
+            # seuls avertissements et erreurs de yt-dlp passent (sur stderr)
+            "quiet": quiet,
+            "noprogress": quiet,
             "ignoreerrors": False,
             "progress_hooks": [self._progress_hook],
             "postprocessor_hooks": [self._postprocessor_hook],
             **load_cookie(),
         }
 
-    def download_media(self):
+    def download_media(self, wait: bool = True):
+        """
+        Télécharge le média. Fusion et déplacement des fichiers passent par
+        l'étage de post-traitement : avec wait=False, la méthode rend la main
+        dès que les flux sont sur le disque et renvoie un Future qui se
+        termine avec le dernier post-traitement.
+        """
+        from yt_dlp.utils import DownloadError
+
+        # Part de ce téléchargement dans le débit global
+        self.bandwidth = get_bandwidth_manager().stream()
+        try:
+            try:
+                self._download_media()
+            except DownloadError as e:
+                if not refresh_browser_cookies(e):
+                    raise
+                # Cookies du navigateur périmés : nouvelle extraction, un seul essai
+                self.recorder.count("cookie_refreshes")
+                for key in ("cookiefile", "cookiefrombrowser"):
+                    self.ydl_opts.pop(key, None)
+                self.ydl_opts.update(load_cookie())
+                self._download_media()
+        except BaseException:
+            when_all(self._postprocessing).add_done_callback(
+                lambda _: self._finish("error")
+            )
+            raise
+        finally:
+            self.bandwidth.close()
+
+        done = self._completion()
+        if wait:
+            done.result()
+        return done
+
+    def _completion(self):
+        """
+        Future du téléchargement complet, post-traitements compris ; son
+        résultat est le nombre d'entrées de playlist en échec.
+        """
+        from concurrent.futures import Future
+
+        done = Future()
+
+        def complete(all_done):
+            errors = [f.exception() for f in all_done.result() if f.exception()]
+            # Playlist : un échec ne concerne que son entrée, compté à part
+            if errors and not isinstance(self.media, Playlist):
+                self._finish("error")
+                done.set_exception(errors[0])
+            else:
+                failed = len(self._failed_entries)
+                self._finish("partial" if failed else "ok")
+                done.set_result(failed)
+
+        when_all(self._postprocessing).add_done_callback(complete)
+        return done
+
+    def _finish(self, status: str):
+        if isinstance(self.media, Video):
+            self.media.info = None  # Libère l'info_dict (formats, URL...)
+        self.recorder.finish(status)
+
+    def _acquire(self, opts: dict, current_video=None):
+        """
+        YoutubeDL du pool, instrumenté pour ce téléchargement. Avec
+        `current_video`, ses post-traitements sont reportés sur l'étage dédié.
+        """
+        if current_video is not None:
+            opts = {
+                **opts,
+                "defer_post_process": partial(self._defer_post_process, current_video),
+            }
+        return get_ydl_pool().acquire(self._metrics.bind(opts))
+
+    def _defer_post_process(self, current_video, job):
+        """Met le post-traitement d'une entrée en file ; le réseau passe à la suite."""
+        self._publish(current_video, {"status": "postprocessing", "postprocessor": None})
+        future = get_postprocessing_stage().submit(
+            self._run_post_process, current_video, job, time.perf_counter()
+        )
+        self._postprocessing.append(future)
+        self._entry_postprocessing[current_video] = future
+        return future
+
+    def _run_post_process(self, current_video, job, queued_at):
+        self.recorder.add("postprocess_queue", time.perf_counter() - queued_at)
+        try:
+            info = job()
+        except Exception as e:
+            print(f"\n❌ Post-traitement ({current_video}) : {e}", file=sys.stderr)
+            self._publish_failed(current_video)
+            raise
+        self._publish_finished(current_video)
+        return info
+
+    def _download_media(self):
         match self.media:
             case Video():
                 self._download_video(self.media.url)
@@ -39,84 +167,256 @@ class Engine:
                 self._download_playlist(self.media.url)
 
     def _download_video(self, url):
-        output_dir = AppSettings.load_download_folder()
+        output_dir = self.output_dir
         format_selector = get_format_selector(self.media.resol_selected)
         video_opts = {
             **self.ydl_opts,
+            **self._transfer_opts(1),
             "format": format_selector,
             "outtmpl": os.path.join(output_dir, "Videos/%(title)s.%(ext)s"),
         }
 
-        print(f"📥 Téléchargement vidéo avec le format : {format_selector}")
-        with yt_dlp.YoutubeDL(video_opts) as ydl:
-            ydl.download([url])
+        print(f"📥 Téléchargement vidéo avec le format : {format_selector}", file=sys.stderr)
+        with self._acquire(video_opts, current_video=1) as ydl:
+            self._download_shared(
+                ydl,
+                {"id": self.media.id, "title": self.media.title},
+                lambda: self._download_analysed(ydl, url),
+            )
 
     def _download_short(self, url):
-        output_dir = AppSettings.load_download_folder()
+        output_dir = self.output_dir
         short_opts = {
             **self.ydl_opts,
+            **self._transfer_opts(1),
             "outtmpl": os.path.join(output_dir, "Shorts/%(title)s.%(ext)s"),
         }
-        with yt_dlp.YoutubeDL(short_opts) as ydl:
-            ydl.download([url])
+        with self._acquire(short_opts, current_video=1) as ydl:
+            self._download_shared(
+                ydl,
+                {"id": self.media.id, "title": self.media.title},
+                lambda: self._download_analysed(ydl, url),
+            )
+
+    def _download_analysed(self, ydl, url):
+        """
+        Télécharge à partir de l'info_dict de l'analyse (process_ie_result)
+        tant que ses URL de flux sont valides ; sinon, ou si le flux est
+        refusé, nouvelle extraction complète de la page.
+        """
+        from yt_dlp.utils import DownloadError
+
+        # Consommée une seule fois : une nouvelle tentative ré-extrait
+        info, self.media.info = self.media.info, None
+        if info is None or not is_info_fresh(info):
+            return ydl.extract_info(url, download=True)
+        try:
+            result = ydl.process_ie_result(info, download=True)
+        except DownloadError as e:
+            if is_auth_error(e):
+                raise  # Géré par download_media (cookies rafraîchis)
+            print(f"\n⚠ Flux de l'analyse inutilisables ({e}) : nouvelle extraction", file=sys.stderr)
+            self.recorder.count("reextractions")
+            return ydl.extract_info(url, download=True)
+        self.recorder.count("info_reused")
+        return result
 
     def _download_playlist(self, url):
-        output_dir = AppSettings.load_download_folder()
+        output_dir = self.output_dir
+
+        # 1. Listing complet déjà obtenu pendant l'analyse : pas de second crawl
+        if self.media.listed:
+            entries = list(self.media.entries)
+            info = {**self.media.info, "playlist_count": len(entries), "entries": entries}
+            print(f"\n🎬 Playlist : {self.media.title}", file=sys.stderr)
+            print(f"📦 {len(entries)} vidéo(s) (listing de l'analyse)\n", file=sys.stderr)
+            self._download_entries(info, output_dir)
+            return
 
-        # 1. On extrait d'abord les infos de la playlist TRÈS RAPIDEMENT avec extract_flat
+        # Sinon (analyse interrompue, reprise du journal) : listing unique
+        # avec extract_flat, dont les entrées alimentent le téléchargement
         flat_opts = {**self.ydl_opts, "extract_flat": True, "quiet": True}
-        with yt_dlp.YoutubeDL(flat_opts) as ydl:
+        start = time.perf_counter()
+        with self.recorder.phase("listing"), self._acquire(flat_opts) as ydl:
             info = ydl.extract_info(url, download=False)
-            playlist_title = info.get("title", "Playlist inconnue")
-            total = len(info.get("entries", []))
-            print(f"\n🎬 Playlist : {playlist_title}")
-            print(f"📦 {total} vidéo(s) détectée(s)\n")
+        self.timings["playlist_listing"] = time.perf_counter() - start
 
-        # 2. On lance le téléchargement réel sans extract_flat
-        playlist_opts = {
+        playlist_title = info.get("title", "Playlist inconnue")
+        total = len(info.get("entries") or [])
+        print(f"\n🎬 Playlist : {playlist_title}", file=sys.stderr)
+        print(
+            f"📦 {total} vidéo(s) détectée(s) "
+            f"en {self.timings['playlist_listing']:.2f}s\n",
+            file=sys.stderr,
+        )
+
+        # 2. Téléchargement à partir du listing déjà obtenu (pas de second crawl)
+        self._download_entries(info, output_dir)
+
+    def _download_entries(self, info, output_dir):
+        """
+        Répartit les entrées de la playlist entre `playlist_workers` workers
+        (un seul = séquentiel), chaque entrée passant par la déduplication.
+        """
+        entries = info.get("entries") or []
+        indexes = info.get("requested_entries") or range(1, len(entries) + 1)
+        # Métadonnées communes (playlist, playlist_title, __last_playlist_index...)
+        # pour que %(playlist)s et %(playlist_index)s restent identiques
+        from yt_dlp import YoutubeDL
+
+        common = YoutubeDL._playlist_infodict(info, n_entries=len(entries))
+        entry_opts = {
             **self.ydl_opts,
             "outtmpl": os.path.join(
                 output_dir,
                 "Playlists/%(playlist)s/%(playlist_index)s - %(title)s.%(ext)s",
             ),
-            "noplaylist": False,
         }
-        with yt_dlp.YoutubeDL(playlist_opts) as ydl:
-            ydl.download([url])
+
+        def download_entry(index, entry):
+            extra = {**common, "playlist_index": index}
+            try:
+                opts = {**entry_opts, **self._transfer_opts(index)}
+                with self._acquire(opts, current_video=index) as ydl:
+                    self._download_shared(
+                        ydl,
+                        {**entry, **extra},
+                        lambda: ydl.process_ie_result(
+                            entry, download=True, extra_info=extra
+                        ),
+                        current_video=index,
+                    )
+            except Exception as e:
+                print(f"\n❌ Entrée {index} : {e}", file=sys.stderr)
+                self._publish_failed(index)
+
+        with ThreadPoolExecutor(max(1, self.playlist_workers)) as pool:
+            for index, entry in zip(indexes, entries):
+                if entry:
+                    pool.submit(download_entry, index, entry)
+                else:
+                    # Entrée indisponible (privée, supprimée) : comptée comme échouée
+                    self._publish_failed(index)
+
+    def _transfer_opts(self, current_video) -> dict:
+        """Parallélisme des fragments et taille des blocs HTTP pour cette entrée."""
+        if not self.tuner:
+            return {}
+        options = self._transfer[current_video] = self.tuner.options()
+        return options
+
+    def _download_shared(self, ydl, info: dict, run, current_video=1):
+        """
+        Lance `run()` sauf si le même média, au même format, est déjà
+        téléchargé ou en cours dans une autre file : on attend alors ce
+        téléchargement et on lie le fichier obtenu vers notre destination.
+        """
+        self._metrics.start_entry(info.get("id"))
+        if not info.get("id"):
+            run()
+            return
+        registry = get_dedup_registry()
+        while True:
+            claim = registry.claim(info["id"], ydl.params.get("format"))
+            if claim.owner:
+                try:
+                    result = run()
+                except BaseException:
+                    claim.fail()
+                    raise
+                future = self._entry_postprocessing.pop(current_video, None)
+                if future is None:
+                    claim.resolve(downloaded_path(result or {}))
+                else:
+                    # Fichier final connu à la fin du post-traitement
+                    future.add_done_callback(partial(self._resolve_claim, claim))
+                return
+            with self.recorder.phase("dedup_wait"):
+                source = claim.wait()
+            if source is not None:
+                break
+            # Le téléchargement partagé a échoué : on retente nous-mêmes
+
+        ext = os.path.splitext(source)[1].lstrip(".")
+        target = ydl.prepare_filename({**info, "ext": ext})
+        print(f"🔗 Déjà téléchargé : {os.path.basename(source)}", file=sys.stderr)
+        with self.recorder.phase("move"):
+            link_or_copy(source, target)
+        self.recorder.count("dedup_hits")
+        self._publish_finished(current_video)
+
+    @staticmethod
+    def _resolve_claim(claim, future):
+        if future.exception() is not None:
+            claim.fail()
+        else:
+            claim.resolve(future.result().get("filepath"))
+
+    def _publish(self, current_video, state: dict):
+        if self.progress:
+            self.progress.publish(
+                current_video,
+                {"percent": 1.0, "current_video": current_video, **state},
+            )
+
+    def _publish_finished(self, current_video):
+        self._publish(current_video, {"status": "finished"})
+
+    def _publish_failed(self, current_video):
+        if isinstance(self.media, Playlist):
+            self.recorder.count("entry_errors")
+            self._failed_entries.add(current_video)
+        self._publish(current_video, {"status": "error"})
 
     def _progress_hook(self, d: dict):
+        if d["status"] == "finished" and self.tuner:
+            current_video = d.get("info_dict", {}).get("playlist_index") or 1
+            self.tuner.record(
+                self._transfer.get(current_video, {}),
+                d,
+                limited=get_bandwidth_manager().limited,
+            )
         if d["status"] == "downloading":
+            # Le hook tourne dans le thread de téléchargement : y attendre
+            # ralentit la lecture du flux
+            if self.bandwidth:
+                self.bandwidth.consume_progress(d)
             info = d.get("info_dict", {})
-            current_video = info.get("playlist_index", 1)
+            current_video = info.get("playlist_index") or 1
 
-            if self.queue:
-                downloaded = d.get("downloaded_bytes", 0)
-                total = d.get("total_bytes") or d.get("total_bytes_estimate", 0)
-                percent = (downloaded / total) if total else 0
-                self.queue.put(
+            if self.progress:
+                downloaded = d.get("downloaded_bytes") or 0
+                total = d.get("total_bytes") or d.get("total_bytes_estimate") or 0
+                self.progress.publish(
+                    current_video,
                     {
-                        "percent": percent,
-                        "speed": _strip_ansi(d.get("_speed_str", "—")).strip(),
+                        "status": "downloading",
+                        "percent": (downloaded / total) if total else 0.0,
+                        "downloaded": downloaded,
+                        "total_bytes": total,
+                        "speed": d.get("speed"),  # octets/s
+                        "eta": d.get("eta"),  # secondes
                         "current_video": current_video,
-                    }
+                        "total": info.get("n_entries"),
+                    },
                 )
             else:
                 title = info.get("title", "Inconnu")
                 percent = d.get("_percent_str", "?%").strip()
                 speed = d.get("_speed_str", "?").strip()
                 print(
-                    f"\r  ⬇ [{title}] {percent}  vitesse: {speed}", end="", flush=True
+                    f"\r  ⬇ [{title}] {percent}  vitesse: {speed}",
+                    end="",
+                    flush=True,
+                    file=sys.stderr,
                 )
 
     def _postprocessor_hook(self, d: dict):
-        if d["status"] == "finished":
-            if self.queue:
-                info = d.get("info_dict", {})
-                current_video = info.get("playlist_index", 1)
-                self.queue.put(
-                    {
-                        "percent": 1.0,
-                        "speed": "✔ Terminé",
-                        "current_video": current_video,
-                    }
-                )
+        # La fin ("finished") est publiée une fois tous les post-traitements
+        # de l'entrée terminés, par l'étage de post-traitement
+        if d["status"] == "started":
+            info = d.get("info_dict", {})
+            self._publish(
+                info.get("playlist_index") or 1,
+                {"status": "postprocessing", "postprocessor": d.get("postprocessor")},
+            )
@@ -0,0 +1,139 @@
+from .bandwidth import KIB, get_bandwidth_manager
+from .transfer_tuning import recent_throughput
+
+MB = 1024 * 1024
+
+
+class QualityOption:
+    """
+    Une qualité proposée à l'utilisateur ("1080p") et la taille estimée des
+    formats que get_format_selector retiendra pour elle.
+    """
+
+    def __init__(self, label: str, height: int, size: int | None, exact: bool, format_ids):
+        self.label = label
+        self.height = height
+        self.size = size  # octets, None si inconnue
+        self.exact = exact  # False : estimation (filesize_approx ou tbr)
+        self.format_ids = format_ids
+
+    def __repr__(self):
+        return f"QualityOption({self.label!r}, size={self.size}, formats={self.format_ids})"
+
+
+def estimate_size(f: dict, duration) -> tuple[int | None, bool]:
+    """Taille d'un format : exacte, approchée par yt-dlp, sinon débit × durée."""
+    if f.get("filesize"):
+        return f["filesize"], True
+    if f.get("filesize_approx"):
+        return f["filesize_approx"], False
+    if f.get("tbr") and duration:
+        return int(f["tbr"] * 1000 / 8 * duration), False  # tbr en kbit/s
+    return None, False
+
+
+def _is_video(f: dict) -> bool:
+    # Exclut storyboards (sb0, sb1...) et formats sans vidéo
+    return (
+        bool(f.get("height"))
+        and f.get("vcodec") not in (None, "none")
+        and not (f.get("format_id") or "").startswith("sb")
+    )
+
+
+def _is_audio_only(f: dict) -> bool:
+    return f.get("vcodec") == "none" and f.get("acodec") not in (None, "none")
+
+
+def _video_key(f: dict):
+    # Ordre approché du tri yt-dlp à codec égal : définition, fps, débit
+    return (f.get("height") or 0, f.get("fps") or 0, f.get("tbr") or 0)
+
+
+def _best(formats, key):
+    return max(formats, key=key) if formats else None
+
+
+def _pick(videos, audios, height):
+    """
+    Formats retenus pour une hauteur maximale, dans l'ordre des alternatives
+    de get_format_selector : avc1 + m4a, puis tout codec + meilleur audio,
+    puis un format déjà muxé.
+    """
+    allowed = [f for f in videos if f["height"] <= height]
+    video = _best([f for f in allowed if (f.get("vcodec") or "").startswith("avc1")], _video_key)
+    audio = _best([f for f in audios if f.get("ext") == "m4a"], lambda f: f.get("abr") or f.get("tbr") or 0)
+    if video is None or audio is None:
+        video = _best(allowed, _video_key)
+        audio = _best(audios, lambda f: f.get("abr") or f.get("tbr") or 0)
+    if video is None:
+        return []
+    # bv* accepte un format muxé : l'audio est alors déjà inclus
+    if audio is None or video.get("acodec") not in (None, "none"):
+        return [video]
+    return [video, audio]
+
+
+def rank_formats(formats: list[dict], duration) -> list[QualityOption]:
+    """
+    Qualités disponibles, de la meilleure à la plus légère, avec la taille
+    estimée de ce qui sera réellement téléchargé pour chacune.
+    """
+    formats = formats or []
+    videos = [f for f in formats if _is_video(f)]
+    audios = [f for f in formats if _is_audio_only(f)]
+
+    options = []
+    for height in sorted({f["height"] for f in videos}, reverse=True):
+        picked = _pick(videos, audios, height)
+        sizes = [estimate_size(f, duration) for f in picked]
+        known = [size for size, _ in sizes]
+        options.append(
+            QualityOption(
+                label=f"{height}p",
+                height=height,
+                size=sum(known) if picked and None not in known else None,
+                exact=all(exact for _, exact in sizes),
+                format_ids=[f.get("format_id") for f in picked],
+            )
+        )
+    return options
+
+
+def expected_throughput() -> float | None:
+    """
+    Débit attendu (octets/s) : médiane des derniers transferts mesurés,
+    plafonnée par le limiteur de débit ; None si rien ne permet de l'estimer.
+    """
+    manager = get_bandwidth_manager()
+    measured = recent_throughput()
+    candidates = [measured] if measured else []
+    candidates += [limit * KIB for limit in (manager.current_limit(), manager.per_download) if limit]
+    return min(candidates) if candidates else None
+
+
+def budget_bytes(max_mb: float | None = None, max_minutes: float | None = None) -> int | None:
+    """Budget en octets d'une politique (taille maximale et/ou durée maximale)."""
+    budgets = []
+    if max_mb:
+        budgets.append(max_mb * MB)
+    if max_minutes:
+        throughput = expected_throughput()
+        if throughput:
+            budgets.append(throughput * max_minutes * 60)
+    return int(min(budgets)) if budgets else None
+
+
+def pick_quality(options: list[QualityOption], max_bytes: int | None) -> QualityOption | None:
+    """
+    Meilleure qualité dont la taille estimée tient dans le budget ; à défaut,
+    la plus légère. None si aucune taille n'est connue (la qualité choisie
+    par l'utilisateur s'applique alors).
+    """
+    sized = [o for o in options if o.size is not None]
+    if not sized:
+        return None
+    if max_bytes is None:
+        return sized[0]
+    fitting = [o for o in sized if o.size <= max_bytes]
+    return fitting[0] if fitting else min(sized, key=lambda o: o.size)
@@ -1,8 +1,12 @@
+import re
+import time
 from urllib.parse import urlencode, urlparse, parse_qs, urlunparse
 from core import AppSettings
+from .cookie_cache import get_cookie_cache, is_auth_error
 
 
-def get_format_selector(res: str):
+def max_height(res: str) -> int:
+    """Hauteur maximale d'une qualité ("4k", "720p"...), 1080 par défaut."""
     quality_map = {
         "4k": 2160,
         "2160p": 2160,
@@ -12,8 +16,16 @@ def get_format_selector(res: str):
         "480p": 480,
         "360p": 360,
     }
-    max_res = quality_map.get(res, 1080)
+    max_res = quality_map.get(res)
+    if max_res is None:
+        # Toute autre hauteur proposée par le classement des formats ("240p"...)
+        digits = (res or "").removesuffix("p")
+        max_res = int(digits) if digits.isdigit() else 1080
+    return max_res
+
 
+def get_format_selector(res: str):
+    max_res = max_height(res)
     # On accepte avc1 EN PRIORITÉ, mais on autorise VP9/AV1 en fallback
     return (
         f"bv*[height<={max_res}][vcodec^=avc1]+ba[ext=m4a]/"
@@ -23,6 +35,51 @@ def get_format_selector(res: str):
     )
 
 
+# Champs lourds inutiles au téléchargement (sous-titres auto : ~150 langues)
+_UNUSED_INFO_KEYS = ("automatic_captions", "subtitles", "heatmap")
+# Champs du traitement précédent, recalculés par process_ie_result
+_PROCESSED_INFO_KEYS = (
+    "requested_downloads", "requested_formats", "requested_subtitles",
+    "_filename", "filename", "filepath",
+)
+# Expiration des URL de flux : ?expire=... (direct) ou /expire/.../ (manifestes DASH)
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d+)")
+INFO_MAX_AGE = 3600  # sans date d'expiration connue
+INFO_EXPIRY_MARGIN = 300
+
+
+def reusable_info(info: dict) -> dict:
+    """
+    Sous-ensemble de l'info_dict d'analyse suffisant pour télécharger sans
+    nouvelle extraction (formats et URL de flux compris).
+    """
+    return {
+        k: v
+        for k, v in info.items()
+        if k not in _UNUSED_INFO_KEYS and k not in _PROCESSED_INFO_KEYS
+    }
+
+
+def streams_expire_at(info: dict) -> int | None:
+    """Première expiration (timestamp) des URL de flux, None si inconnue."""
+    expiries = [
+        int(match.group(1))
+        for f in info.get("formats") or []
+        for key in ("url", "manifest_url", "fragment_base_url")
+        if (match := _EXPIRE_RE.search(f.get(key) or ""))
+    ]
+    return min(expiries) if expiries else None
+
+
+def is_info_fresh(info: dict) -> bool:
+    """Les URL de flux de l'info_dict sont encore utilisables."""
+    now = time.time()
+    expire = streams_expire_at(info)
+    if expire is not None:
+        return expire - INFO_EXPIRY_MARGIN > now
+    return now - info.get("epoch", 0) < INFO_MAX_AGE
+
+
 def clean_url(url):
     if not url:
         return url
@@ -42,6 +99,31 @@ def clean_url(url):
     return urlunparse(parsed_url._replace(query=new_query))
 
 
+def is_playlist_url(url) -> bool:
+    """Lien de playlist pure (list= sans vidéo précise)."""
+    if not url:
+        return False
+    query_params = parse_qs(urlparse(url).query)
+    return "list" in query_params and "v" not in query_params
+
+
+def extract_video_id(url) -> str | None:
+    """Id vidéo normalisé (watch?v=, youtu.be/, /shorts/), None sinon."""
+    if not url:
+        return None
+    parsed_url = urlparse(url)
+    query_params = parse_qs(parsed_url.query)
+    if "v" in query_params:
+        return query_params["v"][0]
+
+    parts = [p for p in parsed_url.path.split("/") if p]
+    if parsed_url.netloc.endswith("youtu.be") and parts:
+        return parts[0]
+    if len(parts) >= 2 and parts[0] in ("shorts", "embed", "live"):
+        return parts[1]
+    return None
+
+
 def format_duration(seconds):
     if not seconds:
         return "0:00"
@@ -54,10 +136,21 @@ def format_duration(seconds):
 
 
 def load_cookie():
-    cookie_file = AppSettings.load_cookie_file()[0]
-    cookie_config = (
-        {f"cookiefile": cookie_file}
-        if cookie_file
-        else {"cookiefrombrowser": ("chrome",)}
-    )
-    return cookie_config
+    cookie_file = (AppSettings.load_cookie_file() or [""])[0]
+    if cookie_file:
+        return {"cookiefile": cookie_file}
+
+    # Cookies de Chrome extraits une fois dans un jar privé (voir cookie_cache)
+    browser_jar = get_cookie_cache().get_cookiefile()
+    return {"cookiefile": browser_jar} if browser_jar else {}
+
+
+def refresh_browser_cookies(error: Exception) -> bool:
+    """
+    Après un échec d'authentification, force une nouvelle extraction des
+    cookies du navigateur. True si l'appelant doit réessayer.
+    """
+    if (AppSettings.load_cookie_file() or [""])[0] or not is_auth_error(error):
+        return False
+    get_cookie_cache().invalidate()
+    return True
@@ -0,0 +1,139 @@
+import json
+import sqlite3
+import threading
+import time
+from core import user_config_dir
+from models import Video, Short, Playlist
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+PARTIAL = "partial"  # playlist terminée avec des entrées en échec
+
+
+def _dump_media(media) -> tuple[str, dict]:
+    data = {
+        "id": media.id,
+        "title": media.title,
+        "url": media.url,
+        "thumbnail": media.thumbnail,
+    }
+    match media:
+        case Playlist():
+            return "playlist", {**data, "count": media.count}
+        case Short():
+            kind = "short"
+        case Video():
+            kind = "video"
+    return kind, {**data, "duration": media.duration, "res_list": media.res_list}
+
+
+def _load_media(kind: str, data: dict, quality):
+    if kind == "playlist":
+        media = Playlist(**data)
+        media.complete = True  # Le listing sera refait par l'Engine
+        return media
+    media = (Short if kind == "short" else Video)(**data)
+    media.resol_selected = quality
+    return media
+
+
+class DownloadJournal:
+    """
+    Journal persistant (SQLite) de la file de téléchargement : chaque élément
+    y est écrit dès sa mise en file, puis à chaque changement d'état. Après un
+    arrêt brutal, les éléments non terminés sont remis en file ; yt-dlp
+    reprend alors les fichiers .part au lieu de tout retélécharger.
+    """
+
+    def __init__(self, path=None, keep_finished: int = 7 * 24 * 3600):
+        self.path = path or (user_config_dir() / "downloads.sqlite3")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        # WAL : chaque transition est durable sans bloquer les lectures
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS downloads ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " media TEXT NOT NULL,"
+            " quality TEXT,"
+            " output_dir TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " error TEXT,"
+            " created REAL NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+        self._db.execute(
+            "DELETE FROM downloads WHERE state IN (?, ?, ?) AND updated < ?",
+            (DONE, FAILED, PARTIAL, time.time() - keep_finished),
+        )
+        self._db.commit()
+
+    def add(self, media, quality, output_dir: str) -> int:
+        kind, data = _dump_media(media)
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO downloads"
+                " (kind, media, quality, output_dir, state, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, json.dumps(data), quality, output_dir, PENDING, now, now),
+            )
+            self._db.commit()
+            return cursor.lastrowid
+
+    def mark(self, entry_id: int, state: str, error: str | None = None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE downloads SET state = ?, error = ?, updated = ? WHERE id = ?",
+                (state, error, time.time(), entry_id),
+            )
+            self._db.commit()
+
+    def unfinished(self) -> list[dict]:
+        """
+        Éléments à remettre en file, dans leur ordre d'arrivée. Un élément
+        resté "running" a été interrompu : il repart en attente.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, kind, media, quality, output_dir FROM downloads"
+                " WHERE state IN (?, ?) ORDER BY id",
+                (PENDING, RUNNING),
+            ).fetchall()
+            self._db.execute(
+                "UPDATE downloads SET state = ? WHERE state = ?", (PENDING, RUNNING)
+            )
+            self._db.commit()
+
+        entries = []
+        for entry_id, kind, data, quality, output_dir in rows:
+            try:
+                media = _load_media(kind, json.loads(data), quality)
+            except (TypeError, ValueError):
+                self.mark(entry_id, FAILED, "entrée du journal illisible")
+                continue
+            entries.append(
+                {
+                    "id": entry_id,
+                    "media": media,
+                    "quality": quality,
+                    "output_dir": output_dir,
+                }
+            )
+        return entries
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_download_journal() -> DownloadJournal:
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = DownloadJournal()
+        return _journal
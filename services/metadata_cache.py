@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import threading
+import time
+from core import AppSettings, user_cache_dir
+
+# Champs de format nécessaires au classement des qualités (format_ranking)
+_FORMAT_FIELDS = (
+    "format_id", "height", "vcodec", "acodec", "ext", "fps", "tbr", "abr",
+    "filesize", "filesize_approx",
+)
+
+
+def compact_info(info: dict) -> dict:
+    """Ne garde de l'info_dict que ce dont analyze_url a besoin."""
+    return {
+        "id": info.get("id"),
+        "title": info.get("title"),
+        "duration": info.get("duration", 0),
+        "formats": [
+            {k: f.get(k) for k in _FORMAT_FIELDS} for f in info.get("formats", [])
+        ],
+    }
+
+
+class MetadataCache:
+    """
+    Cache disque (SQLite) des métadonnées d'analyse, indexé par id vidéo.
+    Les entrées expirent après `ttl` secondes ; au-delà de `max_entries`,
+    les moins récemment utilisées sont supprimées.
+    """
+
+    def __init__(self, path=None, ttl: int = 24 * 3600, max_entries: int = 1000, enabled: bool = True):
+        self.path = path or (user_cache_dir() / "metadata.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            " id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, media_id: str) -> dict | None:
+        if not self.enabled or not media_id:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, created FROM metadata WHERE id = ?", (media_id,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._db.execute("DELETE FROM metadata WHERE id = ?", (media_id,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE metadata SET accessed = ? WHERE id = ?", (now, media_id)
+            )
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, media_id: str, info: dict):
+        if not self.enabled or not media_id:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO metadata (id, data, created, accessed)"
+                " VALUES (?, ?, ?, ?)",
+                (media_id, json.dumps(info), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM metadata")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def _evict(self):
+        self._db.execute(
+            "DELETE FROM metadata WHERE id IN ("
+            " SELECT id FROM metadata ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache(enabled=AppSettings.load_metadata_cache())
+        return _cache
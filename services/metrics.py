@@ -0,0 +1,244 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from core import AppSettings, user_cache_dir
+
+# Post-processeurs yt-dlp -> phase mesurée
+_PP_PHASES = {"Merger": "merge", "MoveFiles": "move"}
+MAX_JSONL_SIZE = 5 * 1024 * 1024
+
+
+class PhaseRecorder:
+    """
+    Durées par phase et compteurs d'une opération (une analyse, un
+    téléchargement). Les phases d'entrées traitées en parallèle s'additionnent :
+    `total_s` seul est une durée murale.
+    """
+
+    def __init__(self, event: str, **labels):
+        self.event = event
+        self.labels = labels
+        self.phases = defaultdict(float)
+        self.counters = defaultdict(int)
+        self._marks = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def add(self, phase: str, seconds: float):
+        with self._lock:
+            self.phases[phase] += max(0.0, seconds)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] += value
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def mark(self, key, name: str):
+        """Horodate un jalon (début d'entrée, fin d'extraction...)."""
+        with self._lock:
+            self._marks[(key, name)] = time.perf_counter()
+
+    def since(self, key, name: str, phase: str):
+        """Ajoute à `phase` le temps écoulé depuis le jalon `name`."""
+        with self._lock:
+            start = self._marks.get((key, name))
+        if start is not None:
+            self.add(phase, time.perf_counter() - start)
+
+    def finish(self, status: str = "ok", registry=None):
+        event = {
+            "event": self.event,
+            "time": round(time.time(), 3),
+            **self.labels,
+            "status": status,
+            "total_s": round(time.perf_counter() - self._start, 4),
+            "phases": {k: round(v, 4) for k, v in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+        (registry or get_metrics_registry()).record(event)
+        return event
+
+
+class YDLMetricsLogger:
+    """
+    Logger yt-dlp : même affichage que sans logger, mais compte au passage
+    les nouvelles tentatives ("Retrying") des téléchargeurs et extracteurs.
+    """
+
+    def __init__(self, recorder: PhaseRecorder, quiet: bool = False):
+        self._recorder = recorder
+        self._quiet = quiet
+
+    def debug(self, message: str):
+        if "Retrying" in message:
+            self._recorder.count("retries")
+        if message.startswith("[debug] ") or self._quiet:
+            return
+        # Lignes de progression ("\r[download] 42%...") : pas de retour à la ligne
+        end = "" if message.startswith("\r") else "\n"
+        sys.stdout.write(message + end)
+        sys.stdout.flush()
+
+    def info(self, message: str):
+        self.debug(message)
+
+    def warning(self, message: str):
+        if "Retrying" in message:
+            self._recorder.count("retries")
+        print(f"WARNING: {message}", file=sys.stderr)
+
+    def error(self, message: str):
+        print(message, file=sys.stderr)
+
+
+class YDLMetrics:
+    """
+    Branche un PhaseRecorder sur une instance YoutubeDL : options à ajouter
+    au jeu d'options (logger, sondes de phase, hooks), et découpage par entrée
+    en extraction / sélection de format / transfert / fusion / déplacement.
+    """
+
+    def __init__(self, recorder: PhaseRecorder):
+        self.recorder = recorder
+        self._fragments = {}  # fichier -> nombre de fragments
+
+    def bind(self, opts: dict) -> dict:
+        """Jeu d'options complété (les hooks existants sont conservés)."""
+        return {
+            **opts,
+            "logger": YDLMetricsLogger(self.recorder, opts.get("quiet", False)),
+            "phase_hooks": [*opts.get("phase_hooks", []), self._phase_hook],
+            "progress_hooks": [*opts.get("progress_hooks", []), self._progress_hook],
+            "postprocessor_hooks": [
+                *opts.get("postprocessor_hooks", []),
+                self._postprocessor_hook,
+            ],
+        }
+
+    def start_entry(self, key):
+        self.recorder.mark(key, "start")
+
+    def _phase_hook(self, when: str, info: dict):
+        key = info.get("id")
+        if when == "pre_process":
+            self.recorder.since(key, "start", "extract")
+            self.recorder.mark(key, "extracted")
+        elif when == "video":
+            self.recorder.since(key, "extracted", "format_selection")
+
+    def _progress_hook(self, d: dict):
+        filename = d.get("filename")
+        if d["status"] == "downloading":
+            if d.get("fragment_count"):
+                self._fragments[filename] = d["fragment_count"]
+        elif d["status"] == "finished":
+            if d.get("elapsed"):  # absent si le fichier existait déjà
+                self.recorder.add("transfer", d["elapsed"])
+            self.recorder.count("bytes", d.get("total_bytes") or d.get("downloaded_bytes") or 0)
+            self.recorder.count("files")
+            self.recorder.count("fragments", self._fragments.pop(filename, 0))
+
+    def _postprocessor_hook(self, d: dict):
+        name = d.get("postprocessor")
+        key = ((d.get("info_dict") or {}).get("id"), name)
+        if d["status"] == "started":
+            self.recorder.mark(key, "pp")
+        elif d["status"] == "finished":
+            self.recorder.since(key, "pp", _PP_PHASES.get(name, "postprocess"))
+
+
+class MetricsRegistry:
+    """
+    Agrège les événements (analyses, téléchargements) et les exporte : une
+    ligne JSON par événement, et/ou un fichier texte Prometheus (collecteur
+    "textfile" de node_exporter) réécrit de façon atomique.
+    """
+
+    def __init__(self, export: str = "jsonl", directory=None):
+        self.export = export
+        self.directory = str(directory or user_cache_dir())
+        self.jsonl_path = os.path.join(self.directory, "metrics.jsonl")
+        self.prometheus_path = os.path.join(self.directory, "tubedl.prom")
+        self._lock = threading.Lock()
+        self._totals = defaultdict(float)  # (métrique, labels triés) -> valeur
+
+    def record(self, event: dict):
+        labels = {"event": event["event"], "kind": event.get("kind", "")}
+        with self._lock:
+            self._add("tubedl_events_total", 1, status=event["status"], **labels)
+            self._add("tubedl_duration_seconds_total", event["total_s"], **labels)
+            for phase, seconds in event["phases"].items():
+                self._add("tubedl_phase_seconds_total", seconds, phase=phase, **labels)
+                self._add("tubedl_phase_runs_total", 1, phase=phase, **labels)
+            for name, value in event["counters"].items():
+                self._add(f"tubedl_{name}_total", value, **labels)
+
+            if self.export in ("jsonl", "both"):
+                self._append_jsonl(event)
+            if self.export in ("prometheus", "both"):
+                self._write_prometheus()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._totals)
+
+    def _add(self, metric, value, **labels):
+        self._totals[(metric, tuple(sorted(labels.items())))] += value
+
+    def _append_jsonl(self, event):
+        try:
+            if os.path.exists(self.jsonl_path) and os.path.getsize(self.jsonl_path) > MAX_JSONL_SIZE:
+                os.replace(self.jsonl_path, f"{self.jsonl_path}.1")
+            with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(event) + "\n")
+        except OSError as e:
+            print(f"⚠ Métriques non écrites : {e}", file=sys.stderr)
+
+    def _write_prometheus(self):
+        lines = []
+        for metric in sorted({m for m, _ in self._totals}):
+            lines.append(f"# TYPE {metric} counter")
+            for (name, labels), value in sorted(self._totals.items()):
+                if name == metric:
+                    rendered = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{metric}{{{rendered}}} {_prom_value(value)}")
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".prom.tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp, self.prometheus_path)
+        except OSError as e:
+            print(f"⚠ Métriques non écrites : {e}", file=sys.stderr)
+
+
+def _prom_value(value) -> str:
+    # Valeur complète : {:g} tronque à 6 chiffres significatifs (octets cumulés)
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(
+                AppSettings.load_metrics_export(), AppSettings.load_metrics_dir() or None
+            )
+    return _registry
@@ -0,0 +1,95 @@
+import threading
+from collections import deque
+from concurrent.futures import Future
+from core import AppSettings
+
+
+def when_all(futures) -> Future:
+    """Future terminé quand tous ceux de `futures` le sont (résultat : la liste)."""
+    futures = list(futures)
+    done = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            done.set_result(futures)
+
+    if not futures:
+        done.set_result(futures)
+    for future in futures:
+        future.add_done_callback(on_done)
+    return done
+
+
+class PostProcessingStage:
+    """
+    Étage de post-traitement (fusion ffmpeg, déplacement des fichiers) séparé
+    du téléchargement : un worker réseau y dépose ses fichiers et passe aussitôt
+    à l'élément suivant. Les post-traitements ont leur propre file, traitée
+    dans l'ordre d'arrivée, et leur propre limite de concurrence (disque, CPU).
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._max_workers = max(1, max_workers)
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self.running = 0
+
+    def submit(self, fn, *args) -> Future:
+        future = Future()
+        with self._lock:
+            self._queue.append((future, fn, args))
+            self._spawn_workers()
+        return future
+
+    def set_max_workers(self, max_workers: int):
+        with self._lock:
+            self._max_workers = max(1, max_workers)
+            self._spawn_workers()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    def _spawn_workers(self):
+        # Un worker de plus par élément en file qu'aucun worker libre ne prendra
+        while self._workers < self._max_workers and self._workers - self.running < len(self._queue):
+            self._workers += 1
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                # Limite abaissée ou file vide : le worker s'arrête
+                if self._workers > self._max_workers or not self._queue:
+                    self._workers -= 1
+                    return
+                future, fn, args = self._queue.popleft()
+                self.running += 1
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+
+_stage = None
+_stage_lock = threading.Lock()
+
+
+def get_postprocessing_stage() -> PostProcessingStage:
+    global _stage
+    with _stage_lock:
+        if _stage is None:
+            _stage = PostProcessingStage(AppSettings.load_postprocess_workers())
+    return _stage
@@ -0,0 +1,64 @@
+import threading
+import time
+
+_FINAL_STATUSES = ("finished", "error")
+
+
+class ProgressChannel:
+    """
+    Canal de progression "le dernier gagne" : un seul état en mémoire par clé
+    (entrée de playlist...), et au plus `max_rate` émissions par seconde et
+    par clé. Les états finaux passent toujours.
+    """
+
+    def __init__(self, max_rate: float = 10.0):
+        self._interval = 1.0 / max_rate if max_rate else 0.0
+        self._lock = threading.Lock()
+        self._latest: dict = {}
+        self._dirty: set = set()
+        self._last_emit: dict = {}
+
+    def publish(self, key, state: dict):
+        with self._lock:
+            self._latest[key] = state
+            self._dirty.add(key)
+
+    def drain(self) -> dict:
+        """États modifiés depuis le dernier appel, limités par max_rate."""
+        now = time.monotonic()
+        ready = {}
+        with self._lock:
+            for key in list(self._dirty):
+                state = self._latest[key]
+                last = self._last_emit.get(key)
+                final = state.get("status") in _FINAL_STATUSES
+                if final or last is None or now - last >= self._interval:
+                    ready[key] = state
+                    self._last_emit[key] = now
+                    self._dirty.discard(key)
+        return ready
+
+    def empty(self) -> bool:
+        with self._lock:
+            return not self._dirty
+
+    def scoped(self, scope) -> "ScopedProgress":
+        """Publieur dont les clés sont préfixées par `scope` (canal multiplexé)."""
+        return ScopedProgress(self, scope)
+
+    def forget(self, scope):
+        """Oublie tous les états d'un scope terminé."""
+        with self._lock:
+            for key in [k for k in self._latest if k[0] == scope]:
+                del self._latest[key]
+                self._last_emit.pop(key, None)
+                self._dirty.discard(key)
+
+
+class ScopedProgress:
+    def __init__(self, channel: ProgressChannel, scope):
+        self._channel = channel
+        self.scope = scope
+
+    def publish(self, key, state: dict):
+        self._channel.publish((self.scope, key), state)
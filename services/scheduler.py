@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import threading
+from enum import Enum
+
+
+class TaskState(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class DownloadTask:
+    def __init__(self, media, progress, target, priority: int = 0):
+        self.media = media
+        self.progress = progress
+        self.priority = priority
+        self.state = TaskState.PENDING
+        self.error = None
+        self._target = target
+
+    def run(self):
+        self._target(self.media, self.progress)
+
+
+class DownloadScheduler:
+    """
+    File d'attente globale des téléchargements.
+    Un nombre borné de workers consomme les tâches par priorité
+    (plus petite valeur = plus prioritaire), puis par ordre d'arrivée.
+    """
+
+    def __init__(self, max_workers: int = 3):
+        self._max_workers = max(1, max_workers)
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._paused = False
+        self._workers = 0
+        self.running: list[DownloadTask] = []
+        self.done: list[DownloadTask] = []
+
+    # ── API publique ───────────────────────────────────────────────────────
+    def submit(self, media, progress, target, priority: int = 0) -> DownloadTask:
+        task = DownloadTask(media, progress, target, priority)
+        with self._cond:
+            self._push(task)
+            self._spawn_workers()
+            self._cond.notify()
+        return task
+
+    def pause(self):
+        """Les téléchargements en cours terminent, aucun nouveau ne démarre."""
+        with self._cond:
+            self._paused = True
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._spawn_workers()
+            self._cond.notify_all()
+
+    def bump(self, task: DownloadTask, priority: int | None = None):
+        """Fait passer une tâche en attente devant les autres."""
+        with self._cond:
+            if task.state is not TaskState.PENDING:
+                return
+            if priority is None:
+                top = min((entry[0] for entry in self._heap), default=0)
+                priority = top - 1
+            # L'ancienne entrée est ignorée au dépilement (priorité périmée)
+            task.priority = priority
+            self._push(task)
+            self._cond.notify()
+
+    def set_max_workers(self, max_workers: int):
+        with self._cond:
+            self._max_workers = max(1, max_workers)
+            self._spawn_workers()
+            self._cond.notify_all()
+
+    def wait(self):
+        """Bloque jusqu'à ce que la file soit vide et plus rien ne tourne."""
+        with self._cond:
+            while self.running or any(
+                t.state is TaskState.PENDING for _, _, t in self._heap
+            ):
+                self._cond.wait()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def pending(self) -> list[DownloadTask]:
+        with self._cond:
+            tasks = {id(t): t for _, _, t in self._heap if t.state is TaskState.PENDING}
+            return sorted(tasks.values(), key=lambda t: t.priority)
+
+    # ── Interne ───────────────────────────────────────────────────────────
+    def _push(self, task: DownloadTask):
+        heapq.heappush(self._heap, (task.priority, next(self._counter), task))
+
+    def _spawn_workers(self):
+        while self._workers < self._max_workers and self._heap:
+            self._workers += 1
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    def _next_task(self) -> DownloadTask | None:
+        with self._cond:
+            while True:
+                if self._workers > self._max_workers:
+                    self._workers -= 1
+                    return None
+                if not self._paused:
+                    while self._heap:
+                        priority, _, task = heapq.heappop(self._heap)
+                        if task.state is TaskState.PENDING and priority == task.priority:
+                            task.state = TaskState.RUNNING
+                            self.running.append(task)
+                            return task
+                    # File vide : le worker s'arrête, il sera recréé au besoin
+                    self._workers -= 1
+                    return None
+                self._cond.wait()
+
+    def _worker(self):
+        while (task := self._next_task()) is not None:
+            try:
+                task.run()
+                state = TaskState.DONE
+            except Exception as e:
+                task.error = e
+                state = TaskState.FAILED
+            with self._cond:
+                task.state = state
+                self.running.remove(task)
+                self.done.append(task)
+                self._cond.notify_all()
@@ -0,0 +1,182 @@
+import json
+import os
+import statistics
+import threading
+import time
+from core import AppSettings, user_cache_dir
+
+MIB = 1024 * 1024
+# Protocoles découpés en fragments (DASH, HLS) : seul le parallélisme compte
+FRAGMENTED = ("http_dash_segments", "m3u8_native", "m3u8", "f4m", "ism")
+MIN_SAMPLE = 2 * MIB  # en dessous, la mesure n'est pas significative
+LOG_NAME = "transfer_tuning.jsonl"
+
+
+def _powers_of_two(low: int, high: int) -> list[int]:
+    """Bornes incluses, puissances de deux entre les deux : (3, 10) -> [3, 4, 8, 10]."""
+    low = max(1, low)
+    high = max(low, high)
+    values, value = [low], 1
+    while value < high:
+        if value > low:
+            values.append(value)
+        value *= 2
+    return values + [high] if high > low else values
+
+
+class _HillClimber:
+    """
+    Recherche locale sur une liste de valeurs croissantes : on continue dans
+    la même direction tant que le débit progresse, on fait demi-tour sinon.
+    """
+
+    def __init__(self, values: list[int], start: int):
+        self.values = values
+        self.index = min(range(len(values)), key=lambda i: abs(values[i] - start))
+        self.direction = 1
+        self.last = None
+
+    @property
+    def value(self) -> int:
+        return self.values[self.index]
+
+    def record(self, throughput: float):
+        if self.last is not None and throughput < self.last * 0.95:
+            self.direction = -self.direction
+        self.last = throughput
+        index = self.index + self.direction
+        if not 0 <= index < len(self.values):
+            self.direction = -self.direction
+            index = self.index + self.direction
+        self.index = max(0, min(index, len(self.values) - 1))
+
+
+class TransferTuner:
+    """
+    Ajuste `concurrent_fragment_downloads` (DASH/HLS) et `http_chunk_size`
+    (HTTP direct) d'après le débit mesuré à la fin de chaque fichier. Les
+    valeurs ne peuvent changer qu'entre deux fichiers : yt-dlp les lit au
+    démarrage de chacun. Chaque mesure est ajoutée à un journal JSON-lines,
+    dont la dernière ligne sert de point de départ au lancement suivant.
+    """
+
+    MAX_LOG_SIZE = MIB
+
+    def __init__(self, fragment_bounds=(1, 8), chunk_mb_bounds=(1, 32), path=None):
+        self.path = path or (user_cache_dir() / LOG_NAME)
+        self._lock = threading.Lock()
+        last = self._last_record()
+        self._fragments = _HillClimber(
+            _powers_of_two(*fragment_bounds), last.get("fragments", 4)
+        )
+        self._chunk = _HillClimber(
+            _powers_of_two(*chunk_mb_bounds), last.get("chunk_mb", 8)
+        )
+
+    def options(self) -> dict:
+        """Options yt-dlp à utiliser pour le prochain fichier."""
+        with self._lock:
+            return {
+                "concurrent_fragment_downloads": self._fragments.value,
+                "http_chunk_size": self._chunk.value * MIB,
+            }
+
+    def record(self, options: dict, d: dict, limited: bool = False):
+        """
+        Mesure tirée du hook de progression "finished" d'un fichier.
+        `limited` : le limiteur de débit bridait ce fichier, la mesure est
+        journalisée mais n'oriente pas la recherche.
+        """
+        size = d.get("total_bytes") or d.get("downloaded_bytes") or 0
+        elapsed = d.get("elapsed")
+        if size < MIN_SAMPLE or not elapsed:
+            return  # Fichier déjà présent, ou trop petit
+        info = d.get("info_dict") or {}
+        protocol = info.get("protocol") or ""
+        fragmented = protocol.split("+")[0] in FRAGMENTED
+        throughput = size / elapsed
+
+        with self._lock:
+            if not limited:
+                (self._fragments if fragmented else self._chunk).record(throughput)
+            self._append(
+                {
+                    "time": round(time.time()),
+                    "id": info.get("id"),
+                    "format_id": info.get("format_id"),
+                    "protocol": protocol,
+                    "fragments": options.get("concurrent_fragment_downloads"),
+                    "chunk_mb": (options.get("http_chunk_size") or 0) // MIB,
+                    "bytes": size,
+                    "elapsed": round(elapsed, 3),
+                    "throughput": round(throughput),
+                    "limited": limited,
+                    # Valeurs retenues pour les prochains fichiers
+                    "next_fragments": self._fragments.value,
+                    "next_chunk_mb": self._chunk.value,
+                }
+            )
+
+    def _append(self, record: dict):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > self.MAX_LOG_SIZE:
+                os.replace(self.path, f"{self.path}.1")
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass  # Le journal n'est qu'informatif
+
+    def _last_record(self) -> dict:
+        records = _tail_records(self.path, 1)
+        if not records:
+            return {}
+        record = records[-1]
+        return {
+            "fragments": record.get("next_fragments", 4),
+            "chunk_mb": record.get("next_chunk_mb", 8),
+        }
+
+
+def _tail_records(path, count: int) -> list[dict]:
+    """Dernières lignes valides du journal (lecture de la fin du fichier seulement)."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(max(0, os.path.getsize(path) - 512 * count))
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    records = []
+    for line in lines[-count:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # Première ligne tronquée par le seek
+    return records
+
+
+def recent_throughput(path=None, samples: int = 10) -> float | None:
+    """
+    Débit médian (octets/s) des derniers fichiers transférés sans limite de
+    débit, d'après le journal du tuner ; None si aucune mesure.
+    """
+    records = _tail_records(path or (user_cache_dir() / LOG_NAME), samples)
+    measures = [r["throughput"] for r in records if r.get("throughput") and not r.get("limited")]
+    return statistics.median(measures) if measures else None
+
+
+_tuner = None
+_tuner_lock = threading.Lock()
+
+
+def get_transfer_tuner() -> TransferTuner | None:
+    """Tuner partagé, ou None si le mode adaptatif est désactivé."""
+    global _tuner
+    if not AppSettings.load_adaptive_transfer():
+        return None
+    with _tuner_lock:
+        if _tuner is None:
+            _tuner = TransferTuner(
+                AppSettings.load_fragment_downloads_bounds(),
+                AppSettings.load_http_chunk_mb_bounds(),
+            )
+    return _tuner
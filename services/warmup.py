@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+from .ydl_pool import get_ydl_pool
+
+
+class WarmUp:
+    """
+    Préchauffage de la pile d'extraction, lancé une fois la fenêtre affichée :
+    la première analyse ne paie plus l'import de yt_dlp, la construction du
+    YoutubeDL, le chargement des cookies ni l'ouverture des connexions.
+    Chaque étape est chronométrée ; cancel() arrête avant l'étape suivante.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self):
+        steps = (
+            ("import", self._import_extractors),
+            ("ydl", self._prime_ydl),
+            ("thumbnails", self._open_thumbnail_pool),
+        )
+        for name, step in steps:
+            if self.cancelled:
+                break
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                # Simple optimisation : l'analyse refera le travail au besoin
+                print(f"⚠ Préchauffage « {name} » : {e}")
+            self.timings[name] = time.perf_counter() - start
+
+        total = sum(self.timings.values())
+        print(f"🔥 Préchauffage {'annulé' if self.cancelled else 'terminé'} en {total:.2f}s")
+
+    def _import_extractors(self):
+        import yt_dlp  # noqa: F401
+        from yt_dlp.extractor.youtube import YoutubeIE, YoutubeTabIE  # noqa: F401
+
+    def _prime_ydl(self):
+        from yt_dlp.networking import Request
+        from .youtube_service import YouTubeService
+
+        # Mêmes options que l'analyse : l'instance reste chaude dans le pool.
+        # load_cookie() déclenche aussi l'extraction des cookies du navigateur.
+        with get_ydl_pool().acquire(YouTubeService.analysis_opts()) as ydl:
+            ydl.cookiejar  # noqa: B018 - charge le jar
+            cache_dir = ydl.cache._get_root_dir()
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            ydl.get_info_extractor("Youtube")
+            if self.cancelled:
+                return
+            # Connexion keep-alive vers YouTube gardée par le request director
+            ydl.urlopen(Request("https://www.youtube.com/", method="HEAD")).close()
+
+    def _open_thumbnail_pool(self):
+        from utils.thumbnails import get_thumbnail_loader
+
+        get_thumbnail_loader().warm("https://img.youtube.com/")
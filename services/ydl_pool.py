@@ -0,0 +1,228 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from .cookie_cache import get_cookie_cache
+from .postprocessing import when_all
+
+# Réglages de transfert ajustés à presque chaque fichier (transfer_tuning)
+_TRANSFER_KEYS = ("concurrent_fragment_downloads", "http_chunk_size")
+# Objets liés à la tâche (hooks, logger, report du post-traitement, jar de
+# cookies, réglages de transfert) : hors empreinte, rebranchés à chaque prêt
+_HOOK_KEYS = (
+    "progress_hooks", "postprocessor_hooks", "phase_hooks", "logger", "defer_post_process",
+    "cookiefile", *_TRANSFER_KEYS,
+)
+# Étapes yt-dlp signalées aux "phase_hooks" : fin d'extraction, format choisi
+_PHASES = ("pre_process", "video")
+
+
+def fingerprint(opts: dict) -> str:
+    """Empreinte stable des options, hooks et cookies exclus (liés par tâche)."""
+    clean = {k: v for k, v in opts.items() if k not in _HOOK_KEYS}
+    return json.dumps(clean, sort_keys=True, default=repr)
+
+
+class YDLPool:
+    """
+    Instances YoutubeDL "chaudes" réutilisées d'une tâche à l'autre :
+    extracteurs, cookies et connexions HTTP ne sont initialisés qu'une fois
+    par jeu d'options. Une instance n'est prêtée qu'à une tâche à la fois.
+    """
+
+    def __init__(self, max_idle_per_key: int = 8, max_keys: int = 16):
+        self._max_idle = max_idle_per_key
+        self._max_keys = max_keys
+        self._idle: dict[str, list] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @contextmanager
+    def acquire(self, opts: dict):
+        key = fingerprint(opts)
+        with self._lock:
+            ydl = self._idle[key].pop() if self._idle.get(key) else None
+            if ydl is not None:
+                self.reused += 1
+        if ydl is None:
+            ydl = self._create({k: v for k, v in opts.items() if k not in _HOOK_KEYS})
+            self._install_probes(ydl)
+            self._install_deferral(ydl)
+            self.created += 1
+
+        self._bind_cookies(ydl, opts.get("cookiefile"))
+        self._bind_hooks(ydl, opts)
+        try:
+            yield ydl
+        finally:
+            # Post-traitements reportés encore en cours : l'instance (et ses
+            # hooks) leur reste prêtée jusqu'à leur fin
+            when_all(ydl._deferred).add_done_callback(
+                lambda _: self._give_back(key, ydl)
+            )
+
+    def _give_back(self, key, ydl):
+        self._bind_hooks(ydl, {})
+        self._release(key, ydl)
+
+    def _create(self, opts: dict):
+        # Import différé : yt_dlp (et ses extracteurs) coûte cher au démarrage
+        import yt_dlp
+
+        return yt_dlp.YoutubeDL(opts)
+
+    def close(self):
+        with self._lock:
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in instances:
+            self._close(ydl)
+
+    def _release(self, key, ydl):
+        evicted = []
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) < self._max_idle:
+                idle.append(ydl)
+            else:
+                evicted.append(ydl)
+            # Trop de jeux d'options différents : on libère les plus anciens
+            while len(self._idle) > self._max_keys:
+                oldest = next(iter(self._idle))
+                evicted.extend(self._idle.pop(oldest))
+        for old in evicted:
+            self._close(old)
+
+    @staticmethod
+    def _close(ydl):
+        # close() réécrit le jar : il n'est libéré qu'ensuite
+        ydl.close()
+        get_cookie_cache().release(ydl.params.get("cookiefile"))
+
+    @staticmethod
+    def _bind_cookies(ydl, cookiefile):
+        """
+        Fait lire à l'instance le jar de la tâche : un jar rafraîchi ne vide
+        pas le pool, et l'ancien n'est supprimé qu'une fois plus utilisé.
+        """
+        from yt_dlp.utils import expand_path
+
+        previous = ydl.params.get("cookiefile")
+        if cookiefile == previous:
+            return
+        # Même objet que celui des gestionnaires de requêtes : mis à jour sur place
+        jar = ydl.cookiejar
+        if previous is not None:
+            jar.save()
+        jar.clear()
+        jar.filename = expand_path(cookiefile) if cookiefile is not None else None
+        if jar.filename is not None and os.access(jar.filename, os.R_OK):
+            jar.load()
+        ydl.params["cookiefile"] = cookiefile
+        cache = get_cookie_cache()
+        cache.retain(cookiefile)
+        cache.release(previous)
+
+    @staticmethod
+    def _install_probes(ydl):
+        from yt_dlp.postprocessor.common import PostProcessor
+
+        class PhaseProbe(PostProcessor):
+            """Post-processeur inerte : signale seulement le passage d'une étape."""
+
+            def __init__(self, when):
+                super().__init__()
+                self.when = when
+                self.hooks = []
+
+            def _hook_progress(self, status, info_dict):
+                pass  # Invisible pour les postprocessor_hooks
+
+            def run(self, info):
+                for hook in self.hooks:
+                    hook(self.when, info)
+                return [], info
+
+        ydl._phase_probes = []
+        for when in _PHASES:
+            probe = PhaseProbe(when)
+            ydl.add_post_processor(probe, when=when)
+            ydl._phase_probes.append(probe)
+
+    @staticmethod
+    def _install_deferral(ydl):
+        """
+        post_process (fusion, déplacement...) confié à `defer_post_process` si
+        la tâche en fournit un : cette fonction reçoit le travail à exécuter et
+        renvoie son Future, et process_info se termine sans l'attendre.
+        """
+        from yt_dlp import YoutubeDL
+        from yt_dlp.utils import PostProcessingError
+
+        def post_process(filename, info, files_to_move=None):
+            defer = ydl._defer_post_process
+            if defer is None:
+                return YoutubeDL.post_process(ydl, filename, info, files_to_move)
+            # process_info et process_video_result modifient encore `info`
+            snapshot = dict(info)
+
+            def job():
+                try:
+                    return YoutubeDL.post_process(ydl, filename, snapshot, dict(files_to_move or {}))
+                except PostProcessingError as err:
+                    ydl.report_error(f"Postprocessing: {err}")  # DownloadError
+                    raise
+
+            ydl._deferred.append(defer(job))
+            info["filepath"] = filename
+            return info
+
+        ydl.post_process = post_process
+
+    @staticmethod
+    def _bind_hooks(ydl, opts: dict):
+        # Remplace les hooks de la tâche précédente (attributs internes de
+        # yt-dlp, y compris ceux déjà copiés dans les post-processeurs)
+        ydl._progress_hooks = []
+        ydl._postprocessor_hooks = []
+        ydl._download_retcode = 0
+        for pps in ydl._pps.values():
+            for pp in pps:
+                pp._progress_hooks = [pp.report_progress]
+
+        for hook in opts.get("progress_hooks", []):
+            ydl.add_progress_hook(hook)
+        for hook in opts.get("postprocessor_hooks", []):
+            ydl.add_postprocessor_hook(hook)
+        for probe in ydl._phase_probes:
+            probe.hooks = list(opts.get("phase_hooks", []))
+        ydl.params["logger"] = opts.get("logger")
+        # Relus par chaque téléchargeur : absents = valeurs par défaut de yt-dlp
+        for key in _TRANSFER_KEYS:
+            if key in opts:
+                ydl.params[key] = opts[key]
+            else:
+                ydl.params.pop(key, None)
+        ydl._defer_post_process = opts.get("defer_post_process")
+        ydl._deferred = []
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ydl_pool() -> YDLPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = YDLPool()
+        return _pool
+
+
+def set_ydl_pool(pool: YDLPool):
+    """Remplace le pool partagé (bancs d'essai hors ligne)."""
+    global _pool
+    with _pool_lock:
+        _pool = pool
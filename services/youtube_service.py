@@ -1,11 +1,20 @@
-import yt_dlp
-from .helpers import load_cookie, format_duration
-from models import Video, Short
+import threading
+from itertools import chain
+from .helpers import load_cookie, format_duration, extract_video_id, is_playlist_url
+from .helpers import refresh_browser_cookies, reusable_info
+from .format_ranking import rank_formats
+from .metadata_cache import compact_info, get_metadata_cache
+from .metrics import PhaseRecorder, YDLMetrics
+from .ydl_pool import get_ydl_pool
+from models import Video, Short, Playlist
+from utils.thumbnails import POPUP_SIZE
 from services.helpers import clean_url
 
 
 class YouTubeService:
-    def __init__(self):
+    def __init__(self, prefetch_thumbnails=True):
+        # Inutile hors interface graphique (mode batch)
+        self.prefetch_thumbnails = prefetch_thumbnails
         # On garde une configuration de base légère, mais SANS extract_flat par défaut
         self.ydl_opts = {
             "quiet": True,
@@ -13,83 +22,181 @@ class YouTubeService:
             "noplaylist": True,
         }
 
-    def analyze_url(self, url):
+    def analyze_url(self, url, use_cache=True):
         url = clean_url(url)
+        if is_playlist_url(url):
+            return self._analyze_playlist_streaming(url)
 
+        recorder = PhaseRecorder("analysis", kind="video")
+        cache = get_metadata_cache()
+        video_id = extract_video_id(url)
+
+        status = "error"
+        try:
+            with recorder.phase("cache"):
+                info = cache.get(video_id) if use_cache else None
+            recorder.count("cache_hits", int(info is not None))
+            fresh = info is None
+            if fresh:
+                info = self._extract_info(url, recorder)
+                # Le format est choisi entre la fin de l'extraction et le retour
+                recorder.since(info.get("id"), "extracted", "format_selection")
+                with recorder.phase("cache"):
+                    cache.put(info.get("id"), compact_info(info))
+            recorder.count("formats", len(info.get("formats") or []))
+            with recorder.phase("build"):
+                media = self._build_media(url, info)
+                # Le cache ne garde pas les URL de flux : seule une extraction
+                # fraîche peut servir au téléchargement
+                if fresh:
+                    media.info = reusable_info(info)
+            recorder.labels.update(kind=type(media).__name__.lower(), media_id=media.id)
+            status = "ok"
+        finally:
+            recorder.finish(status)
+        # Préchargement : la miniature arrive en parallèle de l'ouverture du popup
+        if self.prefetch_thumbnails:
+            media.load_thumbnail(POPUP_SIZE)
+        return media
+
+    def _extract_info(self, url, recorder=None):
+        from yt_dlp.utils import DownloadError
+
+        recorder = recorder or PhaseRecorder("analysis")
+        try:
+            return self._extract_info_once(url, recorder)
+        except DownloadError as e:
+            if not refresh_browser_cookies(e):
+                raise
+            recorder.count("cookie_refreshes")
+            return self._extract_info_once(url, recorder)
+
+    @staticmethod
+    def analysis_opts() -> dict:
         # Configuration d'analyse blindée pour la vidéo UNIQUE
-        opts_analyse = {
+        return {
             "quiet": True,
             "skip_download": True,
             "noplaylist": True,
             "extract_flat": False,
             **load_cookie(),
         }
-        with yt_dlp.YoutubeDL(opts_analyse) as ydl:
-            info = ydl.extract_info(url, download=False)
 
-            media_id = info.get("id")
-            duration = info.get("duration", 0)
-            thumbnail = self._build_thumbnail(media_id)
-            formatted_duration = format_duration(duration)
-
-            # S'il s'agit d'un Short
-            is_short = "/shorts/" in url or (duration <= 60)
-            if is_short:
-                return Short(
-                    id=media_id,
-                    title=info.get("title"),
-                    url=url,
-                    thumbnail=thumbnail,
-                    duration=formatted_duration,
-                )
+    def _extract_info_once(self, url, recorder):
+        metrics = YDLMetrics(recorder)
+        metrics.start_entry(extract_video_id(url))
+        with get_ydl_pool().acquire(metrics.bind(self.analysis_opts())) as ydl:
+            return ydl.extract_info(url, download=False)
 
-            # C'est une vidéo classique, isolée avec succès de sa playlist !
-            return Video(
+    def _build_media(self, url, info):
+        media_id = info.get("id")
+        duration = info.get("duration", 0)
+        thumbnail = self._build_thumbnail(media_id)
+        formatted_duration = format_duration(duration)
+
+        # S'il s'agit d'un Short
+        is_short = "/shorts/" in url or (duration <= 60)
+        if is_short:
+            return Short(
                 id=media_id,
                 title=info.get("title"),
                 url=url,
                 thumbnail=thumbnail,
                 duration=formatted_duration,
-                res_list=self._extract_resolutions(
-                    info
-                ),  # Tu auras enfin toutes les résolutions dispo !
             )
 
+        # C'est une vidéo classique, isolée avec succès de sa playlist !
+        options = rank_formats(info.get("formats"), duration)
+        return Video(
+            id=media_id,
+            title=info.get("title"),
+            url=url,
+            thumbnail=thumbnail,
+            duration=formatted_duration,
+            res_list=[o.label for o in options],
+            quality_options=options,
+        )
+
+    def analyze_playlist(self, url):
+        """
+        Générateur : produit d'abord le modèle Playlist dès la première page
+        du listing, puis chaque entrée (dict à plat) au fur et à mesure.
+        """
+        opts = {
+            "quiet": True,
+            "skip_download": True,
+            "extract_flat": "in_playlist",
+            "lazy_playlist": True,
+            **load_cookie(),
+        }
+        with get_ydl_pool().acquire(opts) as ydl:
+            # process=False : les entrées restent un générateur paginé
+            info = ydl.extract_info(url, download=False, process=False)
+            for _ in range(3):
+                if info.get("_type") not in ("url", "url_transparent"):
+                    break
+                info = ydl.extract_info(
+                    info["url"], download=False, process=False, ie_key=info.get("ie_key")
+                )
+
+            entries = iter(info.get("entries") or [])
+            first = next(entries, None)
+            playlist = Playlist(
+                id=info.get("id"),
+                title=info.get("title"),
+                url=url,
+                count=info.get("playlist_count") or 0,
+                thumbnail=(
+                    self._build_thumbnail(first.get("id"))
+                    if first
+                    else info.get("thumbnail", "")
+                ),
+            )
+            playlist.info = {k: v for k, v in info.items() if k != "entries"}
+            yield playlist
+
+            for entry in chain([first] if first else [], entries):
+                if entry:
+                    yield entry
+
+    def _analyze_playlist_streaming(self, url):
+        recorder = PhaseRecorder("analysis", kind="playlist")
+        stream = self.analyze_playlist(url)
+        try:
+            with recorder.phase("first_page"):
+                playlist = next(stream)
+        except BaseException:
+            recorder.finish("error")
+            raise
+        recorder.labels["media_id"] = playlist.id
+        if self.prefetch_thumbnails:
+            playlist.load_thumbnail(POPUP_SIZE)
+
+        def consume():
+            status = "error"
+            try:
+                with recorder.phase("listing"):
+                    for entry in stream:
+                        playlist.add_entry(entry)
+                playlist.listed = True
+                status = "ok"
+            finally:
+                playlist.complete = True
+                recorder.count("entries", len(playlist.entries))
+                recorder.finish(status)
+
+        threading.Thread(target=consume, daemon=True).start()
+        return playlist
+
     def _build_thumbnail(self, video_id: str) -> str:
         return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
 
     def _get_video_thumbails(self, url):
-        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+        with get_ydl_pool().acquire(self.ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             return info.get("thumbnail")
 
     def _get_playlist_thumbails(self, url):
-        # On utilise extract_flat ici pour récupérer le premier lien rapidement
-        opts = {**self.ydl_opts, "extract_flat": True}
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            first_video = info["entries"][0]
-            video_url = first_video["url"]
-
-        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-            video_info = ydl.extract_info(video_url, download=False)
-            return video_info.get("thumbnail")
-
-    def _extract_resolutions(self, info):
-        resolutions = set()
-        for f in info.get("formats", []):
-            height = f.get("height")
-            vcodec = f.get("vcodec")
-            format_id = f.get("format_id", "")
-
-            # Exclure storyboards (sb0, sb1...) et formats sans vidéo
-            if not height:
-                continue
-            if vcodec == "none" or not vcodec:
-                continue
-            if format_id.startswith("sb"):
-                continue
-
-            resolutions.add(f"{height}p")
-
-        return sorted(resolutions, key=lambda x: int(x[:-1]), reverse=True)[:4]
+        # La première entrée du listing suffit : pas de seconde extraction
+        playlist = next(self.analyze_playlist(url))
+        return playlist.thumbnail
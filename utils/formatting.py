@@ -0,0 +1,14 @@
+def format_bytes(value) -> str:
+    if not value:
+        return "0 o"
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "o" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} To"
+
+
+def format_speed(bytes_per_second) -> str:
+    if not bytes_per_second:
+        return "—"
+    return f"{format_bytes(bytes_per_second)}/s"
@@ -0,0 +1,113 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageOps
+from core import user_cache_dir
+
+CARD_SIZE = (114, 80)
+POPUP_SIZE = (210, 145)
+FALLBACK_PATH = "assets/images/fallback.png"
+
+
+class ThumbnailLoader:
+    """
+    Chargement asynchrone des miniatures :
+    session HTTP partagée -> cache disque par id -> LRU mémoire d'images
+    déjà redimensionnées à la taille d'affichage.
+    """
+
+    def __init__(self, max_workers: int = 4, memory_size: int = 256):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="thumb")
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._dir = user_cache_dir() / "thumbnails"
+        self._dir.mkdir(exist_ok=True)
+        self._memory: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._memory_size = memory_size
+        self._inflight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, media_id: str, url: str, size=CARD_SIZE) -> Future:
+        """Future résolu avec une image RGB à la taille demandée."""
+        key = (media_id, tuple(size))
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                future = Future()
+                future.set_result(image)
+                return future
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool.submit(self._load, key, url)
+                self._inflight[key] = future
+            return future
+
+    def warm(self, url: str):
+        """Ouvre une connexion du pool HTTP avant la première miniature."""
+        self._session.head(url, timeout=5).close()
+
+    def get_cached(self, media_id: str, size=CARD_SIZE) -> Image.Image | None:
+        with self._lock:
+            return self._memory.get((media_id, tuple(size)))
+
+    def _load(self, key, url) -> Image.Image:
+        media_id, size = key
+        try:
+            image = ImageOps.fit(self._open(media_id, url), size)
+        except Exception:
+            image = ImageOps.fit(fallback_image(), size)
+
+        with self._lock:
+            self._memory[key] = image
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._memory_size:
+                self._memory.popitem(last=False)
+            self._inflight.pop(key, None)
+        return image
+
+    def _open(self, media_id, url) -> Image.Image:
+        path = self._dir / f"{_safe_name(media_id)}.jpg"
+        if path.exists():
+            return Image.open(path).convert("RGB")
+
+        response = self._session.get(url, timeout=5)
+        response.raise_for_status()
+        # Un seul décodage : convert() échoue si les données sont invalides
+        image = Image.open(BytesIO(response.content)).convert("RGB")
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(response.content)
+        tmp.replace(path)
+        return image
+
+
+def _safe_name(media_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in str(media_id))
+
+
+_fallback = None
+
+
+def fallback_image() -> Image.Image:
+    global _fallback
+    if _fallback is None:
+        _fallback = Image.open(FALLBACK_PATH).convert("RGB")
+    return _fallback
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_thumbnail_loader() -> ThumbnailLoader:
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ThumbnailLoader()
+        return _loader
@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from views.themes.color import *
 from core import AppConfig, AppSettings
+from controllers import Controller
+from .dispatcher import UIDispatcher
 from .widgets.sidebar import Sidebar
 from .home.home_view import HomeView
 from .settings.settings_view import SettingsView
@@ -31,13 +33,27 @@ class App(ctk.CTk):
         self.view_container = ctk.CTkFrame(self, fg_color="transparent")
         self.view_container.pack(side="left", fill="both", expand=True)
 
+        # ── PROGRESSION (une seule boucle pour toutes les cartes) ─────────────
+        self.dispatcher = UIDispatcher(self, Controller.progress_channel())
+
         # ── PAGES ─────────────────────────────────────────────────────────────
-        self.home_view = HomeView(self.view_container)
+        self.home_view = HomeView(self.view_container, dispatcher=self.dispatcher)
         self.settings_view = SettingsView(self.view_container)
 
         # Page par défaut
         self.home_view.pack(fill="both", expand=True)
 
+        # Reprise de la file de la session précédente
+        self.after_idle(self.home_view.restore_queue)
+
+        # Préchauffage de l'extraction une fois la première image affichée
+        self.after_idle(lambda: self.after(200, Controller.start_warmup))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        Controller.cancel_warmup()
+        self.destroy()
+
     def handle_tab_change(self, tab_id: str):
         if tab_id == "settings":
             self.home_view.pack_forget()
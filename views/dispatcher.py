@@ -0,0 +1,54 @@
+import itertools
+import tkinter
+from collections import defaultdict
+
+
+class UIDispatcher:
+    """
+    Unique boucle de rafraîchissement sur la racine Tk.
+    Vide le canal de progression partagé, regroupe les états par carte et
+    appelle chaque handler une fois par cycle. Un handler qui renvoie True
+    (téléchargement terminé) n'est plus suivi ; sans carte suivie, la boucle
+    s'arrête jusqu'au prochain enregistrement.
+    """
+
+    def __init__(self, root, channel, interval: int = 100):
+        self._root = root
+        self._channel = channel
+        self._interval = interval
+        self._handlers = {}
+        self._scopes = itertools.count(1)
+        self._job = None
+
+    def register(self, handler):
+        """Enregistre une carte et renvoie le publieur à donner à l'Engine."""
+        scope = next(self._scopes)
+        self._handlers[scope] = handler
+        if self._job is None:
+            self._job = self._root.after(self._interval, self._tick)
+        return self._channel.scoped(scope)
+
+    def unregister(self, scope):
+        self._handlers.pop(scope, None)
+        self._channel.forget(scope)
+
+    def _tick(self):
+        updates = defaultdict(list)
+        for (scope, _), state in self._channel.drain().items():
+            updates[scope].append(state)
+
+        for scope, states in updates.items():
+            handler = self._handlers.get(scope)
+            if handler is None:
+                continue
+            try:
+                done = handler(states)
+            except tkinter.TclError:
+                done = True  # Widget détruit
+            if done:
+                self.unregister(scope)
+
+        if self._handlers:
+            self._job = self._root.after(self._interval, self._tick)
+        else:
+            self._job = None
@@ -1,14 +1,14 @@
-from queue import Queue
 import customtkinter as ctk
 from controllers import Controller
-from models import Video, Short, Playlist
+from controllers.decorators import show_error
+from models import Video, Short, Playlist, QueueItem
 from views.themes.color import *
-from .widgets import SearchBar, VideoCard, PlaylistCard
+from .widgets import SearchBar, QueueList
 
 class HomeView(ctk.CTkFrame):
-    def __init__(self, parent, **kwargs):
+    def __init__(self, parent, dispatcher, **kwargs):
         super().__init__(parent, fg_color="transparent", **kwargs)
-        self._card_count = 0
+        self._dispatcher = dispatcher
         self._build()
 
     def _build(self):
@@ -34,6 +34,7 @@ class HomeView(ctk.CTkFrame):
             self,
             placeholder="  Coller l'URL YouTube…",
             on_search=self.handle_search,
+            is_current=self.is_current_search,
             on_download=self.handle_download,
         )
         self.search_bar.pack(fill="x", padx=32, pady=(20, 0))
@@ -61,24 +62,35 @@ class HomeView(ctk.CTkFrame):
         )
         self._count_label.pack(side="left", padx=(8, 0))
 
-        # Zone de défilement
-        self.download_frame = ctk.CTkScrollableFrame(
-            self,
-            fg_color="transparent",
-            scrollbar_button_color=BORDER,
-            scrollbar_button_hover_color=PRIMARY_ACCENT,
+        # Pause globale : les téléchargements en cours terminent, la file attend
+        self._pause_btn = ctk.CTkButton(
+            list_header,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12, weight="bold"),
+            fg_color=BG_INPUT,
+            hover_color=BORDER,
+            text_color=TEXT_DARK,
+            height=26,
+            width=110,
+            corner_radius=8,
+            cursor="hand2",
+            command=self._toggle_pause,
         )
-        self.download_frame.pack(fill="both", expand=True, padx=32, pady=(0, 24))
+        self._pause_btn.pack(side="right")
+        self._render_pause()
+
+        # Zone de défilement (virtualisée : seules les lignes visibles existent)
+        self.queue_list = QueueList(self)
 
         # État vide
         self._empty_state = ctk.CTkFrame(
-            self.download_frame,
+            self,
             fg_color=BG_WHITE,
             corner_radius=12,
             border_width=1,
             border_color=BORDER,
         )
-        self._empty_state.pack(fill="x", pady=8)
+        self._empty_state.pack(fill="x", padx=32, pady=8)
 
         ctk.CTkLabel(
             self._empty_state,
@@ -87,35 +99,49 @@ class HomeView(ctk.CTkFrame):
             text_color=TEXT_GRAY,
         ).pack(pady=54)
 
-    def _add_card(self, card):
-        if self._card_count == 0:
+    def _add_item(self, item):
+        if len(self.queue_list) == 0:
             self._empty_state.pack_forget()
-        card.pack(fill="x", pady=(0, 10))
-        self._card_count += 1
-        self._count_label.configure(text=str(self._card_count))
+            self.queue_list.pack(fill="both", expand=True, padx=32, pady=(0, 24))
+        self.queue_list.append(item)
+        self._count_label.configure(text=str(len(self.queue_list)))
+
+    def _on_progress(self, item, updates):
+        done = item.apply(updates)
+        self.queue_list.refresh(item)
+        if done and item.error:
+            show_error(item.error)
+        return done
+
+    def _toggle_pause(self):
+        if Controller.downloads_paused():
+            Controller.resume_downloads()
+        else:
+            Controller.pause_downloads()
+        self._render_pause()
+
+    def _render_pause(self):
+        paused = Controller.downloads_paused()
+        self._pause_btn.configure(text="▶ Reprendre" if paused else "⏸ Pause")
 
     def handle_search(self, query):
-        return Controller.analyse_url(query)
+        return Controller.analyse_url_async(query)
+
+    def is_current_search(self, future):
+        return Controller.is_current_analysis(future)
 
     def handle_download(self, media: Video | Short | Playlist, quality):
-        queue = Queue()
-        if isinstance(media, (Video, Short)):
-            card = VideoCard(
-                self.download_frame,
-                title=media.title,
-                quality=quality,
-                duration=media.duration,
-                preview_image=media.pil_thumbnail,
-                queue=queue,
-                on_download=lambda q: Controller.download(media, q),
-            )
-        else:
-            card = PlaylistCard(
-                self.download_frame,
-                title=media.title,
-                queue=queue,
-                count=media.count,
-                preview_image=media.pil_thumbnail,
-                on_download=lambda q: Controller.download(media, q),
-            )
-        self._add_card(card)
+        if isinstance(media, Video):
+            media.resol_selected = quality
+        self._enqueue(QueueItem(media, quality))
+
+    def restore_queue(self):
+        """Remet en file les téléchargements interrompus (journal)."""
+        for entry in Controller.pending_downloads():
+            self._enqueue(QueueItem(entry["media"], entry["quality"]), entry)
+
+    def _enqueue(self, item, entry=None):
+        self._add_item(item)
+        # Le dispatcher de l'App relaie la progression jusqu'à l'élément
+        progress = self._dispatcher.register(lambda updates: self._on_progress(item, updates))
+        item.task = Controller.download(item.media, progress, entry=entry)
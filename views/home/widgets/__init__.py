@@ -1,3 +1,4 @@
 from .search_bar import SearchBar
 from .video_card import VideoCard
-from .playlist_card import PlaylistCard
\ No newline at end of file
+from .playlist_card import PlaylistCard
+from .queue_list import QueueList
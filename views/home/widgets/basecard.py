@@ -1,20 +1,36 @@
-import threading
-from queue import Queue
 import customtkinter as ctk
 from PIL import Image
+from controllers import Controller
+from utils import round_corners
+from utils.formatting import format_speed
+from utils.thumbnails import CARD_SIZE, fallback_image
 from views.themes.color import *
 
+CARD_HEIGHT = 108
+# Étape de post-traitement affichée (None : en file d'attente de l'étage)
+POSTPROCESSING_TEXT = {
+    None: "Post-traitement en attente…",
+    "Merger": "Fusion…",
+    "MoveFiles": "Finalisation…",
+}
+# État final de l'élément -> (texte, couleur, survol) du bouton
+DONE_STYLE = {
+    "finished": ("✔ Terminé", SUCCESS_COLOR, SUCCESS_HOVER),
+    "partial": ("⚠ Incomplet", WARNING_COLOR, WARNING_HOVER),
+    "error": ("✖ Échec", ERROR_COLOR, ERROR_HOVER),
+}
+
 
 class _BaseCard(ctk.CTkFrame):
-    """Carte de base partagée par VideoCard et PlaylistCard."""
+    """
+    Ligne recyclable de la file d'attente, partagée par VideoCard et
+    PlaylistCard : les widgets sont construits une fois, puis rattachés à
+    l'élément (QueueItem) visible à cette position via bind_item().
+    """
 
     def __init__(
         self,
         parent,
-        title: str,
-        queue: Queue,
-        on_download: callable,
-        preview_image: Image.Image,
         tag_text="",
         tag_color=PRIMARY_ACCENT,
         tag_fg="#FFF",
@@ -26,13 +42,14 @@ class _BaseCard(ctk.CTkFrame):
             corner_radius=12,          # Coins plus arrondis et modernes
             border_width=1,
             border_color=BORDER,       # Bordure douce style SaaS
+            height=CARD_HEIGHT,        # Hauteur fixe : la liste est virtualisée
             **kwargs,
         )
-        self._on_download = on_download
-        self.queue = queue
-        self._build(title, tag_text, tag_color, tag_fg, preview_image)
+        self.pack_propagate(False)
+        self.item = None
+        self._build(tag_text, tag_color, tag_fg)
 
-    def _build(self, title, tag_text, tag_color, tag_fg, preview_image):
+    def _build(self, tag_text, tag_color, tag_fg):
         # ── Vignette placeholder ───────────────────────────────────────────────
         self.thumb = ctk.CTkFrame(
             self,
@@ -44,23 +61,25 @@ class _BaseCard(ctk.CTkFrame):
         self.thumb.pack(side="left", padx=16, pady=14)
         self.thumb.pack_propagate(False)
         
-        ctk.CTkLabel(
+        self._thumb_label = ctk.CTkLabel(
             self.thumb,
             text="",
-            image=ctk.CTkImage(light_image=preview_image, size=(114, 80)),
-        ).place(relx=0.5, rely=0.5, anchor="center")
+            image=ctk.CTkImage(light_image=round_corners(fallback_image()), size=(114, 80)),
+        )
+        self._thumb_label.place(relx=0.5, rely=0.5, anchor="center")
 
         # ── Infos centre ──────────────────────────────────────────────────────
         self.info = ctk.CTkFrame(self, fg_color="transparent")
         self.info.pack(side="left", fill="both", expand=True, padx=(4, 12), pady=14)
 
-        ctk.CTkLabel(
+        self._title_label = ctk.CTkLabel(
             self.info,
-            text=title,
+            text="",
             font=ctk.CTkFont(family="Segoe UI", size=15, weight="bold"), # Police plus moderne
             text_color=TEXT_DARK,
             anchor="w",
-        ).pack(anchor="w")
+        )
+        self._title_label.pack(anchor="w")
 
         self.meta = ctk.CTkFrame(self.info, fg_color="transparent")
         self.meta.pack(anchor="w", pady=(8, 0))
@@ -77,7 +96,7 @@ class _BaseCard(ctk.CTkFrame):
 
         self._dl_btn = ctk.CTkButton(
             self._dl_col,
-            text="En cours...",
+            text="En attente...",
             font=ctk.CTkFont(family="Segoe UI", size=12, weight="bold"),
             fg_color=PRIMARY_ACCENT,
             hover_color=HOVER_ACCENT,
@@ -87,6 +106,7 @@ class _BaseCard(ctk.CTkFrame):
             corner_radius=8,
             cursor="hand2",
             image=self.loading_icon,
+            command=self._bump,
         )
         self._dl_btn.pack()
 
@@ -99,44 +119,92 @@ class _BaseCard(ctk.CTkFrame):
             corner_radius=3,
         )
         self._progress.set(0)
-        self._start_download()
+        self._progress.pack(pady=(8, 0))
 
     def _build_meta(self, tag_text, tag_color, tag_fg):
         pass
 
-    def _start_download(self):
-        self._progress.set(0)
-        self._progress.pack(pady=(8, 0))
-        threading.Thread(target=self._on_download, args=(self.queue,), daemon=True).start()
-        self._watch_queue()
-    def _watch_queue(self):
-            # 1. On vide les messages accumulés dans la queue pour ce cycle
-            while not self.queue.empty():
-                self._dl_btn.configure(image=None)
-                data = self.queue.get_nowait()
-                
-                # On laisse chaque carte gérer son affichage textuel et visuel
-                self._handle_progress_update(data)
-
-            # 2. IMPORTANT : Toujours planifier le prochain check, sans condition !
-            self.after(100, self._watch_queue)
-
-    def _handle_progress_update(self, data):
+    # ── Recyclage ─────────────────────────────────────────────────────────────
+    def bind_item(self, item):
+        """Rattache la ligne à un autre élément de la file."""
+        self.item = item
+        self._title_label.configure(text=item.media.title)
+        self._bind_meta(item)
+        self._show_thumbnail(item)
+        self.render()
+
+    def _bind_meta(self, item):
+        pass
+
+    def _show_thumbnail(self, item):
+        future = item.media.load_thumbnail(CARD_SIZE)
+        if not future.done():
+            self._thumb_label.configure(
+                image=ctk.CTkImage(light_image=round_corners(fallback_image()), size=(114, 80))
+            )
+            self.after(50, lambda: self._watch_thumbnail(item, future))
+            return
+        self._thumb_label.configure(
+            image=ctk.CTkImage(light_image=future.result(), size=(114, 80))
+        )
+
+    def _watch_thumbnail(self, item, future):
+        if self.item is not item:
+            return  # Ligne recyclée entre-temps
+        if not future.done():
+            self.after(50, lambda: self._watch_thumbnail(item, future))
+            return
+        self._thumb_label.configure(
+            image=ctk.CTkImage(light_image=future.result(), size=(114, 80))
+        )
+
+    # ── Affichage de la progression ───────────────────────────────────────────
+    def render(self):
+        """Met les widgets en accord avec l'état de l'élément (un configure par widget)."""
+        item = self.item
+        self._progress.set(item.percent)
+        if item.done:
+            self._on_done(item)
+        elif item.status == "pending":
+            # Un clic fait passer l'élément devant le reste de la file
+            self._dl_btn.configure(
+                text="En attente · ⇡",
+                fg_color=PRIMARY_ACCENT,
+                hover_color=HOVER_ACCENT,
+                image=self.loading_icon,
+            )
+        else:
+            self._dl_btn.configure(
+                text=self._progress_text(item),
+                fg_color=PRIMARY_ACCENT,
+                hover_color=HOVER_ACCENT,
+                image=None,
+            )
+
+    def _bump(self):
+        item = self.item
+        if item is not None and item.status == "pending" and item.task is not None:
+            Controller.bump_download(item.task)
+
+    def _status_text(self, item):
+        if item.status == "finished":
+            return "✔ Terminé"
+        if item.status == "error":
+            return "✖ Échec"
+        if item.status == "postprocessing":
+            return POSTPROCESSING_TEXT.get(item.postprocessor, "Finalisation…")
+        return format_speed(item.speed)
+
+    def _progress_text(self, item):
         """Comportement standard : Utilisé par VideoCard."""
-        percent = data["percent"]
-        speed = data["speed"]
-        
-        self._progress.set(percent)
-        self._dl_btn.configure(text=f"{int(percent * 100)}% • {speed}")
-        
-        if percent >= 1:
-            self._on_done()
+        return f"{int(item.current_percent * 100)}% • {self._status_text(item)}"
 
-    def _on_done(self):
+    def _on_done(self, item):
+        text, color, hover = DONE_STYLE.get(item.status, DONE_STYLE["finished"])
         self._dl_btn.configure(
             state="normal",
-            text="✔ Terminé",
-            fg_color=SUCCESS_COLOR,
-            hover_color=SUCCESS_HOVER,
+            text=text,
+            fg_color=color,
+            hover_color=hover,
             image=None
-        )
\ No newline at end of file
+        )
@@ -1,18 +1,27 @@
 import customtkinter as ctk
 from views.themes.color import *
-from PIL import Image
+from controllers import Controller
 from utils import round_corners
+from utils.formatting import format_bytes
+
+WIDTH, HEIGHT = 500, 430
+# Politiques de budget (index 0 : pas de budget)
+POLICIES = ("Qualité choisie", "Taille max (Mo)", "Durée max (min)")
 
 class DownloaderPopup(ctk.CTkToplevel):
-    def __init__(self, parent, title: str = "", preview_image=None, qualities=[], on_download=None):
+    def __init__(self, parent, title: str = "", preview_image=None, qualities=[], on_download=None, thumbnail_future=None, playlist=None, options=None):
         super().__init__(parent)
         self._title_text = title
         self._preview_image = preview_image
+        self._thumbnail_future = thumbnail_future
+        self._playlist = playlist
         self._on_download = on_download
-        self._qualities = qualities
+        # QualityOption : qualités avec taille estimée (vidéos uniquement)
+        self._options = options or []
+        self._qualities = [o.label for o in self._options] or qualities
 
         self.title("Options de téléchargement")
-        self.geometry("500x380")
+        self.geometry(f"{WIDTH}x{HEIGHT}")
         self.resizable(False, False)
         self.configure(fg_color=BG_WHITE)
         self.withdraw()
@@ -37,21 +46,25 @@ class DownloaderPopup(ctk.CTkToplevel):
         thumb.pack(side="left")
         thumb.pack_propagate(False)
 
-        ctk.CTkLabel(
+        self._thumb_label = ctk.CTkLabel(
             thumb,
             text="",
             image=ctk.CTkImage(light_image=round_corners(self._preview_image), size=(210, 145)),
-        ).place(relx=0.5, rely=0.5, anchor="center")
+        )
+        self._thumb_label.place(relx=0.5, rely=0.5, anchor="center")
+        if self._thumbnail_future:
+            self._watch_thumbnail()
 
-        # Sélection qualité épurée
-        radio_col = ctk.CTkFrame(top_row, fg_color="transparent")
-        radio_col.pack(side="left", padx=(24, 0), pady=4, anchor="n")
+        # Sélection qualité épurée (défilante : toutes les définitions sont proposées)
+        radio_col = ctk.CTkScrollableFrame(top_row, fg_color="transparent", width=200, height=130)
+        radio_col.pack(side="left", padx=(16, 0), anchor="n")
 
         self.quality_var = ctk.StringVar(value=self._qualities[0] if self._qualities else "")
+        sizes = {o.label: o for o in self._options}
         for q in self._qualities:
             ctk.CTkRadioButton(
                 radio_col,
-                text=q,
+                text=self._quality_text(q, sizes.get(q)),
                 value=q,
                 variable=self.quality_var,
                 font=ctk.CTkFont(family="Segoe UI", size=14),
@@ -71,6 +84,21 @@ class DownloaderPopup(ctk.CTkToplevel):
             wraplength=450,
         ).pack(anchor="w", pady=(18, 0))
 
+        # Nombre de vidéos d'une playlist, mis à jour pendant le listing
+        if self._playlist is not None:
+            self._count_label = ctk.CTkLabel(
+                body,
+                text="",
+                font=ctk.CTkFont(family="Segoe UI", size=13),
+                text_color=TEXT_GRAY,
+                anchor="w",
+            )
+            self._count_label.pack(anchor="w")
+            self._watch_playlist()
+
+        if any(o.size for o in self._options):
+            self._build_budget(body)
+
         # Bouton Télécharger Moderne
         self.dl_btn = ctk.CTkButton(
             body,
@@ -85,6 +113,93 @@ class DownloaderPopup(ctk.CTkToplevel):
         )
         self.dl_btn.pack(fill="x", pady=(16, 0))
 
+    @staticmethod
+    def _quality_text(quality, option):
+        if option is None or option.size is None:
+            return quality
+        approx = "" if option.exact else "~"
+        return f"{quality}   {approx}{format_bytes(option.size)}"
+
+    def _build_budget(self, body):
+        row = ctk.CTkFrame(body, fg_color="transparent")
+        row.pack(fill="x", pady=(12, 0))
+
+        self.policy_menu = ctk.CTkOptionMenu(
+            row,
+            values=list(POLICIES),
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            fg_color=BG_INPUT,
+            text_color=TEXT_DARK,
+            button_color=BORDER,
+            button_hover_color=BG_INPUT,
+            dropdown_fg_color=BG_WHITE,
+            dropdown_text_color=TEXT_DARK,
+            dropdown_hover_color=BG_INPUT,
+            corner_radius=6,
+            width=150,
+            command=lambda _: self._apply_budget(),
+        )
+        self.policy_menu.pack(side="left")
+
+        self.budget_var = ctk.StringVar()
+        self.budget_var.trace_add("write", lambda *_: self._apply_budget())
+        ctk.CTkEntry(
+            row,
+            textvariable=self.budget_var,
+            width=70,
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            fg_color=BG_INPUT,
+            border_color=BORDER,
+            text_color=TEXT_DARK,
+        ).pack(side="left", padx=(8, 0))
+
+        self._budget_hint = ctk.CTkLabel(
+            row,
+            text="",
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            text_color=TEXT_GRAY,
+        )
+        self._budget_hint.pack(side="left", padx=(10, 0))
+
+    def _apply_budget(self):
+        """Coche la meilleure qualité qui respecte la politique saisie."""
+        policy = POLICIES.index(self.policy_menu.get())
+        try:
+            value = float(self.budget_var.get().replace(",", "."))
+        except ValueError:
+            value = 0
+        if not policy or value <= 0:
+            self._budget_hint.configure(text="")
+            return
+
+        option = Controller.quality_for_budget(
+            self._options,
+            max_mb=value if policy == 1 else None,
+            max_minutes=value if policy == 2 else None,
+        )
+        if option is None:
+            self._budget_hint.configure(text="débit encore inconnu")
+            return
+        self.quality_var.set(option.label)
+        self._budget_hint.configure(text=f"→ {option.label}")
+
+    def _watch_playlist(self):
+        if not self.winfo_exists():
+            return
+        suffix = "" if self._playlist.complete else " (analyse en cours…)"
+        self._count_label.configure(text=f"{self._playlist.count} vidéos{suffix}")
+        if not self._playlist.complete:
+            self.after(200, self._watch_playlist)
+
+    def _watch_thumbnail(self):
+        if not self.winfo_exists():
+            return
+        if not self._thumbnail_future.done():
+            self.after(50, self._watch_thumbnail)
+            return
+        image = round_corners(self._thumbnail_future.result())
+        self._thumb_label.configure(image=ctk.CTkImage(light_image=image, size=(210, 145)))
+
     def _on_click_download(self):
         quality = self.quality_var.get()
         self.destroy()
@@ -93,6 +208,6 @@ class DownloaderPopup(ctk.CTkToplevel):
 
     def _center_on(self, parent: ctk.CTk):
         parent.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - 500) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - 380) // 2
-        self.geometry(f"500x380+{x}+{y}")
\ No newline at end of file
+        x = parent.winfo_x() + (parent.winfo_width() - WIDTH) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - HEIGHT) // 2
+        self.geometry(f"{WIDTH}x{HEIGHT}+{x}+{y}")
\ No newline at end of file
@@ -0,0 +1,131 @@
+import customtkinter as ctk
+from views.themes.color import *
+from .basecard import CARD_HEIGHT
+from .playlist_card import PlaylistCard
+from .video_card import VideoCard
+
+ROW_SPACING = 10
+ROW_HEIGHT = CARD_HEIGHT + ROW_SPACING
+
+
+class QueueList(ctk.CTkFrame):
+    """
+    Liste virtualisée de la file d'attente : seuls les éléments visibles ont
+    des widgets, et les lignes sorties de l'écran sont recyclées. Les données
+    restent de simples QueueItem, quel que soit leur nombre.
+    """
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, fg_color="transparent", **kwargs)
+        self._items = []
+        self._offset = 0
+        self._rows = {}  # index de l'élément -> ligne affichée
+        self._free = {VideoCard: [], PlaylistCard: []}
+        self._layout_job = None
+
+        self._scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self._on_scrollbar,
+            button_color=BORDER,
+            button_hover_color=PRIMARY_ACCENT,
+        )
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self._viewport.pack(side="left", fill="both", expand=True)
+        self._viewport.bind("<Configure>", lambda e: self._schedule_layout())
+
+        # Molette : liaison globale, filtrée sur les widgets de la liste
+        self.bind_all("<MouseWheel>", self._on_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_wheel, add="+")
+
+    def __len__(self):
+        return len(self._items)
+
+    def append(self, item):
+        self._items.append(item)
+        self._schedule_layout()
+
+    def refresh(self, item):
+        """Redessine l'élément s'il est visible ; sinon rien à faire."""
+        for row in self._rows.values():
+            if row.item is item:
+                row.render()
+                return
+
+    # ── Défilement ────────────────────────────────────────────────────────────
+    def _viewport_height(self):
+        # Coordonnées non mises à l'échelle, comme les hauteurs de ligne
+        return int(self._viewport.winfo_height() / self._get_widget_scaling())
+
+    def _max_offset(self):
+        return max(0, len(self._items) * ROW_HEIGHT - self._viewport_height())
+
+    def _scroll_to(self, offset):
+        offset = min(max(0, int(offset)), self._max_offset())
+        if offset != self._offset:
+            self._offset = offset
+            self._layout()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(value) * len(self._items) * ROW_HEIGHT)
+        elif action == "scroll":
+            step = self._viewport_height() if unit == "pages" else ROW_HEIGHT // 2
+            self._scroll_to(self._offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        widget = event.widget
+        while widget is not None and widget is not self:
+            widget = getattr(widget, "master", None)
+        if widget is None:
+            return  # Molette au-dessus d'un autre widget
+
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._scroll_to(self._offset + delta * ROW_HEIGHT // 2)
+
+    # ── Mise en page ──────────────────────────────────────────────────────────
+    def _schedule_layout(self):
+        # Regroupe les ajouts rapprochés (coller des centaines de liens)
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._layout)
+
+    def _layout(self):
+        self._layout_job = None
+        height = self._viewport_height()
+        self._offset = min(self._offset, self._max_offset())
+        first = self._offset // ROW_HEIGHT
+        last = min(len(self._items), (self._offset + height) // ROW_HEIGHT + 1)
+
+        # 1. Libère les lignes sorties de la zone visible
+        for index in [i for i in self._rows if not first <= i < last]:
+            row = self._rows.pop(index)
+            row.place_forget()
+            self._free[type(row)].append(row)
+
+        # 2. Rattache une ligne (recyclée si possible) à chaque élément visible
+        for index in range(first, last):
+            item = self._items[index]
+            row = self._rows.get(index)
+            if row is None:
+                row = self._acquire(PlaylistCard if item.is_playlist else VideoCard)
+                self._rows[index] = row
+            if row.item is not item:
+                row.bind_item(item)
+            row.place(x=0, y=index * ROW_HEIGHT - self._offset, relwidth=1)
+
+        total = len(self._items) * ROW_HEIGHT
+        if total > height:
+            self._scrollbar.set(self._offset / total, (self._offset + height) / total)
+        else:
+            self._scrollbar.set(0, 1)
+
+    def _acquire(self, row_class):
+        free = self._free[row_class]
+        return free.pop() if free else row_class(self._viewport)
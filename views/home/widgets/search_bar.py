@@ -1,9 +1,10 @@
-from pprint import pprint 
 import customtkinter as ctk
+from controllers.decorators import show_error
 from .popup import DownloaderPopup
 from views.themes.color import *
 from PIL import Image
 from models import Video, Playlist, Short
+from utils.thumbnails import POPUP_SIZE
 
 
 class SearchBar(ctk.CTkFrame):
@@ -12,12 +13,15 @@ class SearchBar(ctk.CTkFrame):
         parent,
         on_search=None,
         on_download=None,
+        is_current=None,
         placeholder="  Collez le lien YouTube ici...",
         **kwargs,
     ):
         super().__init__(parent, fg_color=BG_NONE, **kwargs)
         self._on_search_callback = on_search
         self._on_download_callback = on_download
+        self._is_current = is_current or (lambda future: True)
+        self._pending = None
         self._placeholder = placeholder
         self._build()
 
@@ -56,26 +60,48 @@ class SearchBar(ctk.CTkFrame):
 
     def _on_search(self):
         url = self.entry.get().strip()
-        media = self._on_search_callback(url)
+        if not url:
+            return
+        self._pending = self._on_search_callback(url)
+        self.set_loading(True)
+        self._poll_search(self._pending)
+
+    def _poll_search(self, future):
+        if future is not self._pending:
+            return  # Remplacée par une recherche plus récente
+        if not future.done():
+            self.after(50, lambda: self._poll_search(future))
+            return
+
+        self._pending = None
+        self.set_loading(False)
+        if future.cancelled() or not self._is_current(future):
+            return
+        try:
+            media = future.result()
+        except Exception as e:
+            show_error(e)
+            return
         if not media:
             return
         popup = DownloaderPopup(
             self,
             title=media.title,
-            preview_image=media.pil_thumbnail,
+            preview_image=media.cached_thumbnail(POPUP_SIZE),
+            thumbnail_future=media.load_thumbnail(POPUP_SIZE),
             qualities=media.res_list if isinstance(media, Video) else [],
+            options=media.quality_options if isinstance(media, Video) else None,
             on_download=lambda q: self._on_download_callback(media, q),
+            playlist=media if isinstance(media, Playlist) else None,
         )
         self.after(0, popup.popup)
-        # pprint(media.__dict__)
 
     def set_loading(self, loading: bool):
+        # L'entrée reste active : coller une autre URL remplace l'analyse en cours
         if loading:
             self.btn.configure(state="disabled", text="…", fg_color=BTN_DISABLED)
-            self.entry.configure(state="disabled")
         else:
             self.btn.configure(state="normal", text=None, fg_color=PRIMARY_ACCENT)
-            self.entry.configure(state="normal")
 
     def clear(self):
         self.entry.delete(0, "end")
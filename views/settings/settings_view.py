@@ -2,6 +2,7 @@ import customtkinter as ctk
 from views.themes.color import *
 from core import AppSettings
 from .widgets import SectionTitle, PathSelectorCard, CookiesCard, ThemeSelectorCard
+from .widgets import BandwidthCard, DownloadsCard
 
 
 class SettingsView(ctk.CTkFrame):
@@ -41,7 +42,17 @@ class SettingsView(ctk.CTkFrame):
         self.cookies_card = CookiesCard(container)
         self.cookies_card.pack(fill="x", pady=6)
 
-        # 3. Appearance Setup
+        # 3. Bandwidth Setup
+        SectionTitle(container, "Bande passante").pack(anchor="w", pady=(20, 10))
+        self.bandwidth_card = BandwidthCard(container)
+        self.bandwidth_card.pack(fill="x", pady=6)
+
+        # 4. Concurrency Setup
+        SectionTitle(container, "Téléchargements").pack(anchor="w", pady=(20, 10))
+        self.downloads_card = DownloadsCard(container)
+        self.downloads_card.pack(fill="x", pady=6)
+
+        # 5. Appearance Setup
         SectionTitle(container, "Apparence").pack(anchor="w", pady=(20, 10))
         self.theme_card = ThemeSelectorCard(container)
         self.theme_card.pack(fill="x", pady=6)
@@ -2,3 +2,5 @@ from .section_title import SectionTitle
 from .path_selector_card import PathSelectorCard
 from .cookies_card import CookiesCard
 from .theme_selector_card import ThemeSelectorCard
+from .bandwidth_card import BandwidthCard
+from .downloads_card import DownloadsCard
@@ -0,0 +1,86 @@
+import customtkinter as ctk
+from views.themes.color import *
+from core import AppSettings
+from controllers import Controller
+
+# Libellé -> limite en Ko/s (0 = illimité)
+PRESETS = {
+    "Illimité": 0,
+    "500 Ko/s": 500,
+    "1 Mo/s": 1024,
+    "2 Mo/s": 2 * 1024,
+    "5 Mo/s": 5 * 1024,
+    "10 Mo/s": 10 * 1024,
+    "25 Mo/s": 25 * 1024,
+}
+
+
+class BandwidthCard(ctk.CTkFrame):
+    """Limite de débit globale et par téléchargement, appliquée à chaud."""
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=BG_WHITE,
+            corner_radius=10,
+            border_width=1,
+            border_color=BORDER,
+            **kwargs,
+        )
+
+        self.total_menu = self._add_row(
+            "Débit total", AppSettings.load_bandwidth_limit()
+        )
+        self.per_download_menu = self._add_row(
+            "Par téléchargement", AppSettings.load_bandwidth_per_download()
+        )
+
+    def _add_row(self, label, value):
+        inner = ctk.CTkFrame(self, fg_color="transparent")
+        inner.pack(fill="x", padx=16, pady=12)
+
+        ctk.CTkLabel(
+            inner,
+            text=label,
+            font=ctk.CTkFont(family="Segoe UI", size=13),
+            text_color=TEXT_DARK,
+        ).pack(side="left")
+
+        menu = ctk.CTkOptionMenu(
+            inner,
+            values=list(PRESETS),
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            fg_color=BG_INPUT,
+            text_color=TEXT_DARK,
+            button_color=BORDER,
+            button_hover_color=BG_INPUT,
+            dropdown_fg_color=BG_WHITE,
+            dropdown_text_color=TEXT_DARK,
+            dropdown_hover_color=BG_INPUT,
+            corner_radius=6,
+            width=140,
+            command=self._change_limit,
+        )
+        menu.pack(side="right")
+        menu.set(self._label_for(value))
+        return menu
+
+    @staticmethod
+    def _label_for(value):
+        for label, limit in PRESETS.items():
+            if limit == value:
+                return label
+        # Valeur saisie à la main dans settings.json
+        return f"{value} Ko/s"
+
+    @staticmethod
+    def _value_for(label):
+        if label in PRESETS:
+            return PRESETS[label]
+        return int(label.split()[0])
+
+    def _change_limit(self, _choice):
+        Controller.set_bandwidth(
+            self._value_for(self.total_menu.get()),
+            self._value_for(self.per_download_menu.get()),
+        )
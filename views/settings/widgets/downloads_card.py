@@ -0,0 +1,63 @@
+import customtkinter as ctk
+from views.themes.color import *
+from core import AppSettings
+from controllers import Controller
+
+CHOICES = [str(n) for n in range(1, 9)]
+
+
+class DownloadsCard(ctk.CTkFrame):
+    """Téléchargements et fusions simultanés, appliqués à chaud."""
+
+    def __init__(self, parent, **kwargs):
+        super().__init__(
+            parent,
+            fg_color=BG_WHITE,
+            corner_radius=10,
+            border_width=1,
+            border_color=BORDER,
+            **kwargs,
+        )
+
+        self._add_row(
+            "Téléchargements simultanés",
+            AppSettings.load_max_downloads(),
+            lambda choice: Controller.set_max_downloads(int(choice)),
+        )
+        self._add_row(
+            "Post-traitements simultanés",
+            AppSettings.load_postprocess_workers(),
+            lambda choice: Controller.set_postprocess_workers(int(choice)),
+        )
+
+    def _add_row(self, label, value, command):
+        inner = ctk.CTkFrame(self, fg_color="transparent")
+        inner.pack(fill="x", padx=16, pady=12)
+
+        ctk.CTkLabel(
+            inner,
+            text=label,
+            font=ctk.CTkFont(family="Segoe UI", size=13),
+            text_color=TEXT_DARK,
+        ).pack(side="left")
+
+        # Valeur saisie à la main dans settings.json : proposée telle quelle
+        values = CHOICES if str(value) in CHOICES else CHOICES + [str(value)]
+        menu = ctk.CTkOptionMenu(
+            inner,
+            values=values,
+            font=ctk.CTkFont(family="Segoe UI", size=12),
+            fg_color=BG_INPUT,
+            text_color=TEXT_DARK,
+            button_color=BORDER,
+            button_hover_color=BG_INPUT,
+            dropdown_fg_color=BG_WHITE,
+            dropdown_text_color=TEXT_DARK,
+            dropdown_hover_color=BG_INPUT,
+            corner_radius=6,
+            width=140,
+            command=command,
+        )
+        menu.pack(side="right")
+        menu.set(str(value))
+        return menu
@@ -46,3 +46,7 @@ PROGRESS_BAR_COLOR = (
 )
 SUCCESS_COLOR = "#10B981"  # Vert émeraude fluide
 SUCCESS_HOVER = "#059669"
+ERROR_COLOR = "#E53E3E"  # Rouge franc pour les échecs
+ERROR_HOVER = "#C53030"
+WARNING_COLOR = "#DD6B20"  # Orange : playlist incomplète
+WARNING_HOVER = "#C05621"